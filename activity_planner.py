@@ -0,0 +1,138 @@
+# activity_planner.py
+import numpy as np
+import pandas as pd
+
+# -------------------------
+# Columnar Planner
+# -------------------------
+# Life Balance shows one user's activities several ways: the last seven
+# days, the current calendar week, per-category counts and a filtered
+# list. The activities are held as columns sorted by date, with
+# secondary indexes by date, ISO week and category and per-category sums,
+# so each view is an index lookup instead of a pass over a list of dicts.
+COLUMNS = ["tanggal", "aktivitas", "kategori", "durasi", "intensitas", "catatan", "created_at"]
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def activity_frame(df):
+    """Typed activity columns from a store or CSV frame (vectorized casts)."""
+    out = pd.DataFrame({col: df[col] if col in df.columns else None for col in COLUMNS}, index=df.index)
+    for col in ("tanggal", "aktivitas", "kategori", "created_at"):
+        out[col] = out[col].astype(str)
+    out["catatan"] = out["catatan"].fillna("").astype(str)
+    out["durasi"] = pd.to_numeric(out["durasi"], errors="coerce").fillna(0).astype(np.int64)
+    out["intensitas"] = pd.to_numeric(out["intensitas"], errors="coerce").fillna(1).astype(np.int64)
+    return out.reset_index(drop=True)
+
+
+class ActivityPlanner:
+    """One user's activities, indexed by date, ISO week and category."""
+
+    def __init__(self, df=None):
+        self._df = activity_frame(df) if df is not None else activity_frame(pd.DataFrame(columns=COLUMNS))
+        self._build()
+
+    def _build(self):
+        # Stable sort keeps same-day activities in the order they were added
+        self._df = self._df.sort_values("tanggal", kind="stable").reset_index(drop=True)
+        df = self._df
+        self.dates = pd.to_datetime(df["tanggal"], format=DATE_FORMAT, errors="coerce").to_numpy("datetime64[D]")
+        self.minutes = df["durasi"].to_numpy()
+        self.intensity = df["intensitas"].to_numpy()
+
+        iso = pd.DatetimeIndex(self.dates).isocalendar()
+        weeks = list(zip(iso["year"].fillna(0).astype(int), iso["week"].fillna(0).astype(int)))
+        keys = pd.DataFrame({"week": weeks, "kategori": df["kategori"], "durasi": self.minutes})
+        self._by_category = {cat: np.asarray(pos) for cat, pos in keys.groupby("kategori", sort=True).indices.items()}
+        self._by_week = {week: np.asarray(pos) for week, pos in keys.groupby("week").indices.items()}
+        # Activities and minutes per category
+        self.category_totals = keys.groupby("kategori")["durasi"].agg(["count", "sum"])
+
+    def __len__(self):
+        return len(self._df)
+
+    def append(self, activity):
+        """Add one activity at its date position, updating only the indexes it touches."""
+        row = activity_frame(pd.DataFrame([activity]))
+        date = pd.to_datetime(row["tanggal"], format=DATE_FORMAT, errors="coerce").to_numpy("datetime64[D]")[0]
+        # After existing same-day rows, as the stable sort in _build() would place it
+        i = len(self) if np.isnat(date) else int(np.searchsorted(self.dates, date, side="right"))
+
+        self._df = pd.concat([self._df.iloc[:i], row, self._df.iloc[i:]], ignore_index=True)
+        self.dates = np.insert(self.dates, i, date)
+        self.minutes = np.insert(self.minutes, i, row["durasi"].iloc[0])
+        self.intensity = np.insert(self.intensity, i, row["intensitas"].iloc[0])
+
+        # Positions at or after i move down one; then the new row joins its entries
+        for index in (self._by_category, self._by_week):
+            for key, pos in index.items():
+                index[key] = np.where(pos >= i, pos + 1, pos)
+        kategori = row["kategori"].iloc[0]
+        iso = pd.Timestamp(date).isocalendar() if not np.isnat(date) else (0, 0, 0)
+        for index, key in ((self._by_category, kategori), (self._by_week, (int(iso[0]), int(iso[1])))):
+            pos = index.get(key, np.empty(0, dtype=np.int64))
+            index[key] = np.insert(pos, np.searchsorted(pos, i), i)
+        if kategori not in self.category_totals.index:
+            self.category_totals.loc[kategori] = 0
+            self.category_totals = self.category_totals.sort_index()
+        self.category_totals.loc[kategori, "count"] += 1
+        self.category_totals.loc[kategori, "sum"] += int(row["durasi"].iloc[0])
+
+    # -------------------------
+    # Lookups (row positions)
+    # -------------------------
+    def between(self, start=None, end=None):
+        """Rows dated start <= tanggal < end (either bound may be None)."""
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(start, "D"), side="left")
+        hi = len(self) if end is None else np.searchsorted(self.dates, np.datetime64(end, "D"), side="left")
+        return np.arange(lo, hi)
+
+    def on(self, day):
+        day = np.datetime64(day, "D")
+        return self.between(day, day + 1)
+
+    def in_week(self, iso_year, week):
+        return self._by_week.get((iso_year, week), np.empty(0, dtype=np.int64))
+
+    def in_category(self, kategori):
+        return self._by_category.get(kategori, np.empty(0, dtype=np.int64))
+
+    def categories(self):
+        return sorted(self._by_category)
+
+    def filter(self, search="", kategori=None, intensitas=None):
+        """Rows matching the list filters, newest first."""
+        pos = self.in_category(kategori) if kategori else np.arange(len(self))
+        if intensitas is not None:
+            pos = pos[self.intensity[pos] == intensitas]
+        if search:
+            names = self._df["aktivitas"].to_numpy()[pos].astype(str)
+            pos = pos[np.char.find(np.char.lower(names), search.lower()) >= 0]
+        # Newest date first; a stable sort keeps same-day activities in the
+        # order they were added (undated ones go last)
+        days = self.dates[pos].view(np.int64)
+        days = np.where(np.isnat(self.dates[pos]), np.iinfo(np.int64).min + 1, days)
+        return pos[np.argsort(-days, kind="stable")]
+
+    # -------------------------
+    # Sums & Records
+    # -------------------------
+    def total_minutes(self, pos, categories=None):
+        if categories is not None:
+            pos = np.intersect1d(pos, np.concatenate([self.in_category(c) for c in categories]))
+        return int(self.minutes[pos].sum())
+
+    def mean_intensity(self, pos):
+        return float(self.intensity[pos].mean()) if len(pos) else 0.0
+
+    def count_from(self, pos, day):
+        """How many of `pos` are dated on or after `day`."""
+        return int((self.dates[pos] >= np.datetime64(day, "D")).sum())
+
+    def records(self, pos=None):
+        """Activities as dicts (the shape the store and the cards use)."""
+        df = self._df if pos is None else self._df.iloc[pos]
+        return df.to_dict("records")
+
+    def frame(self):
+        return self._df.copy()
@@ -1,8 +1,10 @@
 # app.py
 import streamlit as st
-from utils import load_data, prepare_data, train_model, calculate_metrics
+import resources
 import sidebar
-from tabs import tab1_home_base, tab2_pulse_check, tab3_welness_map, tab4_life_balance, tab5_digital_compass, tab6_growth_journey
+import page_registry
+import history_cache
+import history_store
 
 # -------------------------
 # Page Config
@@ -110,48 +112,72 @@ def show_footer():
 sidebar.show_sidebar()
 
 # -------------------------
-# Load & Prepare Data
+# Shared Data, Model & Metrics (built once per process, read-only)
 # -------------------------
-df = load_data()
-X, y, features = prepare_data(df)
-
-# -------------------------
-# Train Model & Metrics
-# -------------------------
-model, X_train, X_test, y_train, y_test, y_pred = train_model(X, y)
-metrics = calculate_metrics(y_test, y_pred, X_columns=features, model=model)
+df = resources.get_community_data()
+bundle = resources.get_model_bundle()
+model, metrics = bundle["model"], bundle["metrics"]
+scorer = resources.get_scorer()  # flattened forest behind the shared LRU cache
 
 # -------------------------
 # Navigasi Tab
 # -------------------------
 tab = st.sidebar.radio(
     "Choose Page:",
-    [
-        "Home Base",
-        "Pulse Check",
-        "Wellness Map",
-        "Life Balance",
-        "Digital Compass",
-        "Growth Journey"
-    ],
+    list(page_registry.PAGES),
     key="tab_selection"
 )
 
 # -------------------------
-# Routing Tab
+# Routing Tab (page module imported on first visit)
 # -------------------------
+page = page_registry.load_page(tab)
 if tab == "Home Base":
-    tab1_home_base.run(df, metrics)
+    page.run(df, metrics)
 elif tab == "Pulse Check":
-    tab2_pulse_check.run(model)
+    page.run(scorer)
 elif tab == "Wellness Map":
-    tab3_welness_map.run(df)
+    page.run(df, lattice=resources.get_lattice(), aggregates=resources.get_community_aggregates(),
+             rank_index=resources.get_rank_index(), cohort_index=resources.get_cohort_index(),
+             violin=resources.get_violin(), scorer=scorer)
 elif tab == "Life Balance":
-    tab4_life_balance.run(model)
+    page.run(model)
 elif tab == "Digital Compass":
-    tab5_digital_compass.run(df, metrics)
+    page.run(df, metrics)
 elif tab == "Growth Journey":
-    tab6_growth_journey.run()
+    page.run()
+
+with st.sidebar.expander("⚙️ Shared Resources", expanded=False):
+    st.dataframe(resources.resource_memory_report(), hide_index=True)
+    status = resources.model_status()
+    st.caption(
+        f"Model `{status['version']}` · fit {status['fit_seconds']}s · swapped {status['swapped_at']}"
+    )
+    if status["training"]:
+        st.caption("🔄 Model baru sedang dilatih di latar belakang...")
+    if status["last_error"]:
+        st.caption(f"⚠️ Pelatihan terakhir gagal: {status['last_error']}")
+    cache = resources.prediction_cache_stats()
+    st.caption(
+        f"Prediction cache: {cache['hits']} hit · {cache['misses']} miss · "
+        f"{cache['evictions']} evicted · {cache['size']}/{cache['maxsize']}"
+    )
+    history = history_cache.stats()
+    st.caption(
+        f"History cache: {history['hits']} hit · {history['misses']} miss · "
+        f"{history['evictions']} evicted · {history['size']}/{history['maxsize']}"
+    )
+    writer = history_store.writer_stats()
+    st.caption(
+        f"History writer: {writer['queued']} queued · {writer['batches']} commits · "
+        f"{writer['rows_per_batch']} rows/commit · flush p95 {writer['flush_ms_p95']:.1f} ms · "
+        f"{writer['failed']} failed · fsync {writer['fsync']}"
+    )
+    import_times = page_registry.page_import_times()
+    if import_times:
+        st.caption("Page import: " + " · ".join(
+            f"{label} {seconds * 1000:.0f} ms" for label, seconds in import_times.items()
+        ))
 
 # -------------------------
 # Footer
@@ -0,0 +1,106 @@
+# batch_scoring.py
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from model_store import load_or_train
+
+# -------------------------
+# Column Mapping
+# -------------------------
+# History files written by the app use short names for three of the
+# training features; map them onto the utils.prepare_data names.
+FEATURES = [
+    "screen_time_hours",
+    "work_screen_hours",
+    "leisure_screen_hours",
+    "sleep_hours",
+    "sleep_quality_1_5",
+    "stress_level_0_10",
+    "productivity_0_100",
+]
+
+FEATURE_ALIASES = {
+    "sleep_quality": "sleep_quality_1_5",
+    "stress_level": "stress_level_0_10",
+    "productivity": "productivity_0_100",
+}
+
+SCORE_COLUMN = "batch_wellness_score"
+
+
+def feature_frame(chunk):
+    """The seven model features of a chunk, as float64, under training names."""
+    renamed = chunk.rename(columns={k: v for k, v in FEATURE_ALIASES.items() if v not in chunk.columns})
+    missing = [f for f in FEATURES if f not in renamed.columns]
+    if missing:
+        raise KeyError(f"CSV is missing feature columns: {missing}")
+    return renamed[FEATURES].apply(pd.to_numeric, errors="coerce")
+
+# -------------------------
+# Batch Scoring
+# -------------------------
+def score_frame(model, chunk):
+    """
+    One vectorized predict for every complete row of `chunk`.
+    Rows with a missing or non-numeric feature get NaN.
+    """
+    X = feature_frame(chunk)
+    complete = X.notna().all(axis=1).to_numpy()
+    scores = np.full(len(X), np.nan)
+    if complete.any():
+        scores[complete] = model.predict(X[complete])
+    return scores
+
+
+def score_csv(in_path, out_path, model=None, chunksize=200_000, n_jobs=-1, data_path="data/kaggle.csv"):
+    """
+    Stream `in_path` in chunks, append a score column and write each
+    chunk to `out_path` as soon as it is scored. The model defaults to the
+    model-store artifact of `data_path`, so re-scoring after a retrain only
+    costs a load. Returns rows, seconds and rows per second.
+    """
+    if model is None:
+        model = load_or_train(data_path)[0]
+
+    tmp_path = f"{out_path}.partial"
+    rows = 0
+    start = time.perf_counter()
+    # Forest predict spreads trees over threads when n_jobs is unset on the model
+    with joblib.parallel_config(backend="threading", n_jobs=n_jobs):
+        for i, chunk in enumerate(pd.read_csv(in_path, chunksize=chunksize)):
+            chunk[SCORE_COLUMN] = score_frame(model, chunk)
+            chunk.to_csv(tmp_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+            rows += len(chunk)
+    os.replace(tmp_path, out_path)
+
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds, 1) if seconds else float("inf"),
+    }
+
+# -------------------------
+# Command Line
+# -------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV of daily features with the MindSync wellness model.")
+    parser.add_argument("input", help="CSV with the seven daily feature columns")
+    parser.add_argument("-o", "--output", help="output CSV (default: <input>.scored.csv)")
+    parser.add_argument("--chunksize", type=int, default=200_000, help="rows per chunk")
+    parser.add_argument("--jobs", type=int, default=-1, help="threads for forest predict")
+    parser.add_argument("--data", default="data/kaggle.csv", help="training CSV the model was fit on")
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.splitext(args.input)[0] + ".scored.csv"
+    stats = score_csv(args.input, output, chunksize=args.chunksize, n_jobs=args.jobs, data_path=args.data)
+    print(f"scored {stats['rows']:,} rows in {stats['seconds']}s ({stats['rows_per_sec']:,.0f} rows/s) -> {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+# benchmarks/__init__.py
+"""
+Benchmark suite for MINDSYNC: data loading, training, prediction, page
+renders and the history CSV helpers, parameterized by dataset size.
+
+    python -m benchmarks run --sizes 1000 10000 --out bench.json
+    python -m benchmarks compare bench.json --baseline benchmarks/baseline.json
+"""
@@ -0,0 +1,46 @@
+# benchmarks/__main__.py
+import argparse
+import sys
+
+from benchmarks import runner
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="MINDSYNC benchmark suite.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="run the benchmark cases and save the results as JSON")
+    run_p.add_argument("--sizes", type=int, nargs="+", default=list(runner.DEFAULT_SIZES), help="synthetic dataset sizes")
+    run_p.add_argument("--repeat", type=int, default=5, help="timed repetitions per case")
+    run_p.add_argument("--select", default="*", help="glob on case names, e.g. 'tab*'")
+    run_p.add_argument("--out", default="bench_output.json", help="results file")
+    run_p.add_argument("--baseline", help="compare against this results file after running")
+    run_p.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging (0.2 = 20%%)")
+
+    cmp_p = sub.add_parser("compare", help="compare a results file against a baseline")
+    cmp_p.add_argument("results")
+    cmp_p.add_argument("--baseline", required=True)
+    cmp_p.add_argument("--threshold", type=float, default=0.2)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        doc = runner.run(args.sizes, repeat=args.repeat, select=args.select)
+        runner.save(doc, args.out)
+        print(f"results saved to {args.out}")
+        if not args.baseline:
+            return 0
+        current = doc
+    else:
+        current = runner.load(args.results)
+
+    rows = runner.compare(current, runner.load(args.baseline), threshold=args.threshold)
+    for r in rows:
+        flag = "REGRESSION" if r["regression"] else ""
+        print(f"{r['case']:<36} {r['size']:>10,} {r['baseline_ms']:>12.3f} -> {r['current_ms']:>12.3f} ms  x{r['ratio']:.2f} {flag}")
+    regressions = sum(r["regression"] for r in rows)
+    print(f"{regressions} regression(s) over {len(rows)} comparable case(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
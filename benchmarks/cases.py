@@ -0,0 +1,227 @@
+# benchmarks/cases.py
+import contextlib
+import os
+import sys
+
+import numpy as np
+
+from benchmarks import synthetic
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from community_aggregates import build_aggregates  # noqa: E402
+from cohort_index import CohortIndex  # noqa: E402
+from community_rank import SortedIndex  # noqa: E402
+from community_violin import build_violin  # noqa: E402
+from utils import calculate_metrics, load_data, prepare_data, train_model  # noqa: E402
+
+# -------------------------
+# Sandbox
+# -------------------------
+# The tab helpers read and append to the history store. Every size gets
+# its own directory of synthetic CSVs and its own database, migrated from
+# them on first use, so benchmarks never touch the real data/.
+class Sandbox:
+    def __init__(self, root, size, seed=0):
+        self.root = root
+        self.size = size
+        self.data_dir = os.path.join(root, "data")
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.community_csv = os.path.join(self.data_dir, "kaggle.csv")
+        self.daily_csv = os.path.join(self.data_dir, "user_daily_data.csv")
+        self.activities_csv = os.path.join(self.data_dir, "activities.csv")
+        self.compass_csv = os.path.join(self.data_dir, "digital_compass_data.csv")
+        self.db_path = os.path.join(self.data_dir, "mindsync.db")
+
+        synthetic.community_frame(size, seed).to_csv(self.community_csv, index=False)
+        synthetic.daily_history(size, seed).to_csv(self.daily_csv, index=False)
+        synthetic.activities(size, seed).to_csv(self.activities_csv, index=False)
+        synthetic.compass_history(size, seed).to_csv(self.compass_csv, index=False)
+
+        self.df = load_data(self.community_csv)
+        self.X, self.y, self.features = prepare_data(self.df)
+        # Production-shaped forest; capped rows keep fixture set-up bounded
+        n_fit = min(size, 10_000)
+        self.model, _, X_test, _, y_test, y_pred = train_model(
+            self.X.iloc[:n_fit], self.y.iloc[:n_fit], n_jobs=-1
+        )
+        self.model.set_params(n_jobs=None)
+        self.metrics = calculate_metrics(y_test, y_pred, X_columns=self.features, model=self.model)
+        self.y_test, self.y_pred = y_test, y_pred
+        self.aggregates = build_aggregates(self.df)
+        self.rank_index = SortedIndex(self.df)
+        self.cohort_index = CohortIndex(self.df)
+        self.violin = build_violin(self.df)
+
+    @contextlib.contextmanager
+    def active(self):
+        """Point the history store at this sandbox's database."""
+        import history_store
+
+        saved = (history_store.DATA_DIR, history_store.DB_PATH)
+        history_store.DATA_DIR, history_store.DB_PATH = self.data_dir, self.db_path
+        try:
+            yield self
+        finally:
+            history_store.flush()  # queued saves land before the directory goes away
+            history_store.DATA_DIR, history_store.DB_PATH = saved
+
+# -------------------------
+# Cases
+# -------------------------
+# Each case takes a Sandbox and returns the zero-argument callable to time.
+CASES = {}
+
+
+def case(name, repeat=None):
+    def register(setup):
+        CASES[name] = (setup, repeat)
+        return setup
+    return register
+
+
+@case("utils.load_data")
+def _load_data(sb):
+    return lambda: load_data(sb.community_csv)
+
+
+@case("columnar_cache.load_compact")
+def _load_compact(sb):
+    from columnar_cache import load_compact
+    cache_root = os.path.join(sb.root, "columnar")
+    load_compact(sb.community_csv, cache_root)  # one-time conversion outside the timing
+    return lambda: load_compact(sb.community_csv, cache_root)
+
+
+@case("utils.prepare_data")
+def _prepare_data(sb):
+    return lambda: prepare_data(sb.df)
+
+
+@case("utils.train_model", repeat=1)
+def _train_model(sb):
+    return lambda: train_model(sb.X, sb.y)
+
+
+@case("utils.calculate_metrics")
+def _calculate_metrics(sb):
+    return lambda: calculate_metrics(sb.y_test, sb.y_pred, X_columns=sb.features, model=sb.model)
+
+
+@case("model.predict[1 row]")
+def _predict_one(sb):
+    row = sb.X.iloc[:1]
+    return lambda: sb.model.predict(row)
+
+
+@case("model.predict[batch]")
+def _predict_batch(sb):
+    return lambda: sb.model.predict(sb.X)
+
+# -------------------------
+# CSV Helpers
+# -------------------------
+def _committed(save):
+    # Saves only queue for the history store's writer; time them through
+    # the commit so the numbers measure the write, not the enqueue
+    import history_store
+
+    def timed():
+        save()
+        history_store.flush()
+    return timed
+
+
+@case("tab2.user_history")
+def _tab2_load(sb):
+    import streamlit as st
+    from tabs import tab2_pulse_check
+
+    def load():
+        # What a new session reads on opening Pulse Check
+        st.session_state.pop("history_cache", None)
+        return tab2_pulse_check.user_history().frame()
+    return load
+
+
+@case("tab2.save_user_data")
+def _tab2_save(sb):
+    from tabs import tab2_pulse_check
+    user_input = np.array([[8.0, 4.0, 4.0, 7.0, 8, 5, 70]])
+    return _committed(lambda: tab2_pulse_check.save_user_data(user_input, 53.7))
+
+
+@case("tab4.load_activities_from_csv")
+def _tab4_load(sb):
+    from tabs import tab4_life_balance
+    return tab4_life_balance.load_activities_from_csv
+
+
+@case("tab4.save_activity_to_csv")
+def _tab4_save(sb):
+    from tabs import tab4_life_balance
+    activity = {
+        "tanggal": "2025-11-20", "aktivitas": "Meditasi & Mindfulness", "kategori": "Relaxation",
+        "durasi": 30, "intensitas": 3, "catatan": "", "created_at": "2025-11-20 17:04:06",
+    }
+    return _committed(lambda: tab4_life_balance.save_activity_to_csv(activity))
+
+
+@case("tab5.load_pulse_check_data")
+def _tab5_load_pulse(sb):
+    from tabs import tab5_digital_compass
+    return tab5_digital_compass.load_pulse_check_data
+
+
+@case("tab5.load_digital_compass_history")
+def _tab5_load_history(sb):
+    from tabs import tab5_digital_compass
+    return tab5_digital_compass.load_digital_compass_history
+
+
+@case("tab5.save_digital_compass_data")
+def _tab5_save(sb):
+    from tabs import tab5_digital_compass
+    assessment = {
+        "scores": {0: {"score": 3, "category": "Anxiety"}, 1: {"score": 4, "category": "FOMO"}},
+        "wellness_score": 64.0,
+        "wellness_level": "Moderate",
+    }
+    usage = {"total_daily_mins": 180, "usage_data": {"Instagram": 60, "YouTube": 120}}
+    return _committed(lambda: tab5_digital_compass.save_digital_compass_data(assessment, usage))
+
+# -------------------------
+# Page Renders (Streamlit AppTest)
+# -------------------------
+def _page_script(label, df, metrics, model, aggregates, rank_index, cohort_index, violin):
+    import page_registry
+
+    page = page_registry.load_page(label)
+    if label in ("Home Base", "Digital Compass"):
+        page.run(df, metrics)
+    elif label in ("Pulse Check", "Life Balance"):
+        page.run(model)
+    elif label == "Wellness Map":
+        page.run(df, aggregates=aggregates, rank_index=rank_index, cohort_index=cohort_index, violin=violin)
+    else:
+        page.run()
+
+
+def _page_case(label):
+    def setup(sb):
+        from streamlit.testing.v1 import AppTest
+
+        args = (label, sb.df, sb.metrics, sb.model, sb.aggregates, sb.rank_index, sb.cohort_index, sb.violin)
+
+        def render():
+            at = AppTest.from_function(_page_script, args=args, default_timeout=300).run()
+            if at.exception:
+                raise RuntimeError(f"{label} raised: {at.exception[0].value}")
+        return render
+    return setup
+
+
+for _label in ["Home Base", "Pulse Check", "Wellness Map", "Life Balance", "Digital Compass", "Growth Journey"]:
+    case(f"page[{_label}]", repeat=3)(_page_case(_label))
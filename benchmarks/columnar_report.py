@@ -0,0 +1,97 @@
+# benchmarks/columnar_report.py
+"""
+Load time and resident memory of the community dataset: CSV parse with
+default dtypes versus the memory-mapped columnar cache.
+
+    python -m benchmarks.columnar_report --sizes 10000 1000000 10000000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import synthetic
+from benchmarks.cases import REPO_DIR
+
+CHUNK_ROWS = 1_000_000
+
+# Runs in a fresh interpreter so each loader's memory is measured alone
+_PROBE = r"""
+import json, os, sys, time
+sys.path.insert(0, {repo!r})
+import pandas as pd
+import columnar_cache
+from utils import load_data
+
+def rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+mode, path, cache_root = sys.argv[1], sys.argv[2], sys.argv[3]
+before = rss()
+start = time.perf_counter()
+df = load_data(path) if mode == "csv" else columnar_cache.load_compact(path, cache_root)
+seconds = time.perf_counter() - start
+# Touch every column the pages aggregate over, as a render would
+df.select_dtypes("number").mean()
+print(json.dumps({{
+    "seconds": seconds,
+    "rss_bytes": rss() - before,
+    "frame_bytes": int(df.memory_usage(index=True, deep=True).sum()),
+}}))
+"""
+
+
+def write_csv(path, rows):
+    """Synthetic community CSV written in chunks, so 10M rows fit in memory."""
+    for start in range(0, rows, CHUNK_ROWS):
+        n = min(CHUNK_ROWS, rows - start)
+        chunk = synthetic.community_frame(n, seed=start, first_id=start + 1)
+        chunk.to_csv(path, mode="w" if start == 0 else "a", header=(start == 0), index=False)
+
+
+def _probe(mode, path, cache_root):
+    code = _PROBE.format(repo=REPO_DIR)
+    out = subprocess.run([sys.executable, "-c", code, mode, path, cache_root], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def report(sizes):
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="mindsync-columnar-") as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f"community_{size}.csv")
+            write_csv(path, size)
+            cache_root = os.path.join(tmp, "columnar")
+            csv = _probe("csv", path, cache_root)
+            _probe("columnar", path, cache_root)  # first call converts and writes the cache
+            cached = _probe("columnar", path, cache_root)
+            rows.append({"rows": size, "csv": csv, "columnar": cached})
+            os.remove(path)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--out", help="also save the rows as JSON")
+    args = parser.parse_args(argv)
+
+    rows = report(args.sizes)
+    print(f"{'rows':>12} | {'csv load':>10} {'csv RSS':>10} | {'npy load':>10} {'npy RSS':>10} | {'frame MB':>17}")
+    for r in rows:
+        c, n = r["csv"], r["columnar"]
+        print(
+            f"{r['rows']:>12,} | {c['seconds'] * 1000:>8.1f}ms {c['rss_bytes'] / 2**20:>8.1f}MB | "
+            f"{n['seconds'] * 1000:>8.1f}ms {n['rss_bytes'] / 2**20:>8.1f}MB | "
+            f"{c['frame_bytes'] / 2**20:>7.1f} -> {n['frame_bytes'] / 2**20:>6.1f}"
+        )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
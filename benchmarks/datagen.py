@@ -0,0 +1,308 @@
+# benchmarks/datagen.py
+"""
+Scale-test data fitted to the files in data/: N community rows and M users'
+daily, activity and Digital Compass histories, written in chunks.
+
+    python -m benchmarks.datagen --out /tmp/mindsync-scale --community 10000000 --users 10000
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+from benchmarks.cases import REPO_DIR
+
+DATA_DIR = os.path.join(REPO_DIR, "data")
+CHUNK_ROWS = 1_000_000
+MIN_FIT_ROWS = 30  # fewer clean rows than this and a history is fitted from the community
+HISTORY_DAYS = 365
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# -------------------------
+# Gaussian Copula
+# -------------------------
+# Each column keeps its own empirical distribution; the dependence between
+# columns is the correlation of their normal scores. Sampling draws
+# correlated normals and maps each back through its column's quantiles,
+# so the marginals and rank correlations of the source file carry over.
+def _decimals(values):
+    for d in range(5):
+        if np.array_equal(values, np.round(values, d)):
+            return d
+    return None
+
+
+def _normal_scores(codes):
+    ranks = pd.Series(codes).rank(method="average").to_numpy()
+    return ndtri((ranks - 0.5) / len(codes))
+
+
+class CopulaModel:
+    def __init__(self, marginals, chol):
+        self.marginals = marginals
+        self.chol = chol
+
+    @classmethod
+    def fit(cls, df, numeric, categorical=()):
+        marginals, scores = [], []
+        for col in numeric:
+            values = df[col].to_numpy(dtype=np.float64)
+            marginals.append({
+                "name": col, "kind": "numeric", "sorted": np.sort(values),
+                "integer": pd.api.types.is_integer_dtype(df[col]), "decimals": _decimals(values),
+            })
+            scores.append(_normal_scores(values))
+        for col in categorical:
+            freq = df[col].astype(str).value_counts()
+            cum = np.cumsum(freq.to_numpy()) / freq.sum()
+            marginals.append({"name": col, "kind": "category", "levels": freq.index.to_numpy(), "cum": cum})
+            # Categories sit on consecutive intervals of the uniform scale
+            code = pd.Series(np.arange(len(freq)), index=freq.index)
+            scores.append(_normal_scores(df[col].astype(str).map(code).to_numpy()))
+
+        d, n = len(marginals), len(df)
+        corr = np.nan_to_num(np.corrcoef(np.vstack(scores))) if d > 1 else np.ones((1, 1))
+        # Shrink toward independence when rows are few relative to columns,
+        # then clip eigenvalues so the matrix stays positive definite
+        shrink = min(1.0, d / max(n, 1))
+        corr = (1 - shrink) * corr + shrink * np.eye(d)
+        w, v = np.linalg.eigh(corr)
+        corr = (v * np.clip(w, 1e-6, None)) @ v.T
+        corr /= np.sqrt(np.outer(np.diag(corr), np.diag(corr)))
+        return cls(marginals, np.linalg.cholesky(corr))
+
+    def sample(self, n, rng):
+        u = ndtr(rng.standard_normal((n, len(self.marginals))) @ self.chol.T)
+        out = {}
+        for j, m in enumerate(self.marginals):
+            if m["kind"] == "category":
+                idx = np.minimum(np.searchsorted(m["cum"], u[:, j], side="right"), len(m["levels"]) - 1)
+                out[m["name"]] = m["levels"][idx]
+                continue
+            sorted_values = m["sorted"]
+            values = np.interp(u[:, j] * (len(sorted_values) - 1), np.arange(len(sorted_values)), sorted_values)
+            if m["integer"]:
+                values = np.round(values).astype(np.int64)
+            elif m["decimals"] is not None:
+                values = np.round(values, m["decimals"])
+            out[m["name"]] = values
+        return pd.DataFrame(out)
+
+# -------------------------
+# Fitted Tables
+# -------------------------
+def _read(name):
+    return pd.read_csv(os.path.join(DATA_DIR, name))
+
+
+def _clean_rows(df):
+    # Rows written with a shifted schema leave trailing fields empty
+    return df.dropna().reset_index(drop=True)
+
+
+def _gap_model(dates):
+    """Log-normal fit of the seconds between consecutive entries."""
+    ts = pd.to_datetime(pd.Series(dates), format="mixed", errors="coerce").dropna().sort_values()
+    gaps = ts.diff().dt.total_seconds().to_numpy()[1:]
+    gaps = gaps[gaps > 0]
+    if gaps.size < 2:
+        return np.log(86_400.0), 1.0
+    logs = np.log(gaps)
+    return float(logs.mean()), float(max(logs.std(), 0.1))
+
+
+class CommunityModel:
+    """Rows shaped like data/kaggle.csv."""
+
+    CATEGORICAL = ["gender", "occupation", "work_mode"]
+
+    def __init__(self, source=None):
+        source = _read("kaggle.csv") if source is None else source
+        self.columns = list(source.columns)
+        self.numeric = [c for c in self.columns
+                        if c != "user_id" and not c.startswith("Unnamed") and c not in self.CATEGORICAL]
+        self.copula = CopulaModel.fit(source, self.numeric, self.CATEGORICAL)
+
+    def sample(self, n, rng, first_id=1):
+        df = self.copula.sample(n, rng)
+        # Keep the file's identity: total screen time is work plus leisure
+        df["screen_time_hours"] = (df["work_screen_hours"] + df["leisure_screen_hours"]).round(2)
+        df["user_id"] = [f"U{i:08d}" for i in range(first_id, first_id + n)]
+        for col in self.columns:
+            if col.startswith("Unnamed"):
+                df[col] = np.nan
+        return df[self.columns].rename(columns=lambda c: "" if c.startswith("Unnamed") else c)
+
+
+class DailyModel:
+    """Pulse Check history rows shaped like data/user_daily_data.csv."""
+
+    FROM_COMMUNITY = {
+        "screen_time_hours": "screen_time_hours",
+        "work_screen_hours": "work_screen_hours",
+        "leisure_screen_hours": "leisure_screen_hours",
+        "sleep_hours": "sleep_hours",
+        "sleep_quality": "sleep_quality_1_5",
+        "exercise_minutes": "exercise_minutes_per_week",
+        "social_hours": "social_hours_per_week",
+        "stress_level": "stress_level_0_10",
+        "productivity": "productivity_0_100",
+        "predicted_wellness": "mental_wellness_index_0_100",
+    }
+
+    def __init__(self, community, source=None):
+        source = _read("user_daily_data.csv") if source is None else source
+        self.columns = list(source.columns)
+        self.gaps = _gap_model(source["date"])
+        clean = _clean_rows(source)
+        features = [c for c in self.columns if c != "date"]
+        if len(clean) >= MIN_FIT_ROWS:
+            self.copula, self.community = CopulaModel.fit(clean, features), None
+        else:
+            # Too little clean history: reuse the community's joint distribution
+            self.copula, self.community = None, community
+
+    def sample(self, n, rng):
+        if self.copula is not None:
+            return self.copula.sample(n, rng)
+        src = self.community.copula.sample(n, rng)
+        df = pd.DataFrame({dst: src[col].to_numpy(dtype=np.float64) for dst, col in self.FROM_COMMUNITY.items()})
+        # Snap to the Pulse Check widgets: 0.5 h steps, 1-10 and 0-10 sliders
+        for col, hi in (("work_screen_hours", 12), ("leisure_screen_hours", 12), ("sleep_hours", 12)):
+            df[col] = (np.round(df[col] * 2) / 2).clip(0, hi)
+        df["screen_time_hours"] = (df["work_screen_hours"] + df["leisure_screen_hours"]).clip(0, 20)
+        df["sleep_quality"] = np.round(df["sleep_quality"] * 2).clip(1, 10)
+        df["stress_level"] = np.round(df["stress_level"]).clip(0, 10)
+        df["productivity"] = np.round(df["productivity"]).clip(0, 100)
+        return df
+
+
+class ActivityModel:
+    """Life Balance activity rows shaped like data/activities.csv."""
+
+    def __init__(self, source=None):
+        source = _read("activities.csv") if source is None else source
+        self.columns = list(source.columns)
+        self.gaps = _gap_model(source["created_at"])
+        self.category_of = dict(zip(source["aktivitas"], source["kategori"]))
+        source = source.assign(catatan=source["catatan"].fillna(""))
+        self.copula = CopulaModel.fit(source, ["durasi", "intensitas"], ["aktivitas", "catatan"])
+
+    def sample(self, n, rng):
+        df = self.copula.sample(n, rng)
+        df["kategori"] = df["aktivitas"].map(self.category_of)
+        return df
+
+
+class CompassModel:
+    """Digital Compass rows shaped like data/digital_compass_data.csv."""
+
+    def __init__(self, source=None):
+        source = _read("digital_compass_data.csv") if source is None else source
+        self.columns = list(source.columns)
+        self.gaps = _gap_model(source["date"])
+        self.usage = [c for c in self.columns if c.endswith("_mins") and not c.startswith("total_")]
+        scores = [c for c in self.columns if c.endswith("_score") and c != "digital_wellness_score"]
+        self.copula = CopulaModel.fit(
+            source, ["digital_wellness_score", "total_fomo_score"] + self.usage + scores, ["wellness_level"]
+        )
+
+    def sample(self, n, rng):
+        df = self.copula.sample(n, rng)
+        # Totals as tab5_digital_compass.save_digital_compass_data derives them
+        usage = df[self.usage].to_numpy()
+        df["total_daily_usage_mins"] = usage.sum(axis=1)
+        df["total_platforms_used"] = (usage > 0).sum(axis=1)
+        return df
+
+# -------------------------
+# Histories
+# -------------------------
+def _user_timestamps(lengths, gaps, rng, anchor):
+    """Increasing timestamps per user, ending within HISTORY_DAYS of `anchor`."""
+    n = int(lengths.sum())
+    mu, sigma = gaps
+    elapsed = np.cumsum(np.exp(rng.normal(mu, sigma, n)))
+    # Seconds since each user's first entry
+    offsets = elapsed - np.repeat(elapsed[np.cumsum(lengths) - lengths], lengths)
+    first = np.repeat(rng.uniform(0, HISTORY_DAYS * 86_400, len(lengths)), lengths)
+    seconds = np.minimum(first + offsets, HISTORY_DAYS * 86_400)
+    return anchor - pd.to_timedelta(HISTORY_DAYS * 86_400 - seconds, unit="s")
+
+
+def sample_histories(models, first_user, users, rows_per_user, rng, anchor):
+    """{table: DataFrame} for `users` consecutive users."""
+    out = {}
+    for name, model in models.items():
+        lengths = np.maximum(rng.poisson(rows_per_user, users), 1)
+        n = int(lengths.sum())
+        df = model.sample(n, rng)
+        stamps = pd.DatetimeIndex(_user_timestamps(lengths, model.gaps, rng, anchor)).strftime(TIME_FORMAT)
+        if name == "activities":
+            df["created_at"], df["tanggal"] = stamps, stamps.str[:10]
+        else:
+            df["date"] = stamps
+        df.insert(0, "username", np.repeat([f"user{i:06d}" for i in range(first_user, first_user + users)], lengths))
+        out[name] = df[["username"] + model.columns]
+    return out
+
+# -------------------------
+# Chunked Writers
+# -------------------------
+def write_community(path, rows, seed=0, chunk_rows=CHUNK_ROWS, model=None):
+    """Write `rows` community rows, one chunk in memory at a time."""
+    model = model or CommunityModel()
+    for i, start in enumerate(range(0, rows, chunk_rows)):
+        rng = np.random.default_rng([seed, i])
+        chunk = model.sample(min(chunk_rows, rows - start), rng, first_id=start + 1)
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+    return path
+
+
+def write_histories(out_dir, users, rows_per_user=30, seed=0, chunk_rows=CHUNK_ROWS, community=None):
+    """
+    Write daily, activity and compass histories for `users` users to
+    out_dir, with a leading username column. Returns the file paths.
+    """
+    community = community or CommunityModel()
+    models = {
+        "user_daily_data": DailyModel(community),
+        "activities": ActivityModel(),
+        "digital_compass_data": CompassModel(),
+    }
+    anchor = pd.Timestamp("2025-11-20")
+    paths = {name: os.path.join(out_dir, f"{name}.csv") for name in models}
+    users_per_chunk = max(1, chunk_rows // max(rows_per_user, 1))
+    for i, first in enumerate(range(0, users, users_per_chunk)):
+        rng = np.random.default_rng([seed, 1, i])
+        count = min(users_per_chunk, users - first)
+        for name, df in sample_histories(models, first + 1, count, rows_per_user, rng, anchor).items():
+            df.to_csv(paths[name], mode="w" if i == 0 else "a", header=(i == 0), index=False)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--community", type=int, default=1_000_000, help="community rows")
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--rows-per-user", type=int, default=30, help="mean history rows per user and table")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    start = time.perf_counter()
+    community = CommunityModel()
+    path = write_community(os.path.join(args.out, "kaggle.csv"), args.community, args.seed, args.chunk_rows, community)
+    print(f"{path}: {args.community:,} rows in {time.perf_counter() - start:.1f}s")
+    start = time.perf_counter()
+    paths = write_histories(args.out, args.users, args.rows_per_user, args.seed, args.chunk_rows, community)
+    print(f"{args.users:,} users' histories in {time.perf_counter() - start:.1f}s: {', '.join(paths.values())}")
+
+
+if __name__ == "__main__":
+    main()
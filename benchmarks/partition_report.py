@@ -0,0 +1,102 @@
+# benchmarks/partition_report.py
+"""
+Per-user history loads with many users: one shared CSV re-read, filtered
+and sorted on every load, versus the username-partitioned history store.
+
+    python -m benchmarks.partition_report --users 10000 --rows-per-user 30
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import datagen
+import history_store
+
+TABLES = {"daily": "user_daily_data", "activities": "activities", "compass": "digital_compass_data"}
+
+
+def _csv_load(csv_path, table, username, limit):
+    # What the pages did before: read everything, keep the user's rows, sort
+    date_col = history_store.TABLES[table]["date_column"]
+    df = pd.read_csv(csv_path)
+    df = df[df["username"] == username]
+    df = df.sort_values(date_col, ascending=False)
+    return df if limit is None else df.head(limit)
+
+
+def _store_load(db, table, username, limit):
+    return history_store.history(table, username=username, limit=limit, path=db)
+
+
+def _timings(fn, usernames):
+    out = []
+    for name in usernames:
+        start = time.perf_counter()
+        fn(name)
+        out.append(time.perf_counter() - start)
+    return np.array(out) * 1000
+
+
+def report(users, rows_per_user, probes=50, csv_probes=5, seed=0):
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="mindsync-partition-") as tmp:
+        start = time.perf_counter()
+        paths = datagen.write_histories(tmp, users, rows_per_user, seed)
+        generate_seconds = time.perf_counter() - start
+
+        db = os.path.join(tmp, "mindsync.db")
+        saved = history_store.DATA_DIR
+        history_store.DATA_DIR = tmp  # the store's first connection migrates these files
+        try:
+            start = time.perf_counter()
+            history_store.connect(db)
+            migrate_seconds = time.perf_counter() - start
+
+            rng = np.random.default_rng(seed)
+            sample = [f"user{i:06d}" for i in rng.choice(np.arange(1, users + 1), probes, replace=False)]
+            for table, name in TABLES.items():
+                csv_path = paths[name]
+                for limit in (5, None):
+                    csv_ms = _timings(lambda u: _csv_load(csv_path, table, u, limit), sample[:csv_probes])
+                    store_ms = _timings(lambda u: _store_load(db, table, u, limit), sample)
+                    rows.append({
+                        "table": table,
+                        "limit": limit,
+                        "total_rows": history_store.connect(db).execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0],
+                        "csv_ms": float(np.median(csv_ms)),
+                        "store_ms": float(np.median(store_ms)),
+                        "store_p95_ms": float(np.percentile(store_ms, 95)),
+                    })
+        finally:
+            history_store.close_all()
+            history_store.DATA_DIR = saved
+    return {"users": users, "generate_seconds": generate_seconds, "migrate_seconds": migrate_seconds, "rows": rows}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--rows-per-user", type=int, default=30)
+    parser.add_argument("--out", help="also save the results as JSON")
+    args = parser.parse_args(argv)
+
+    result = report(args.users, args.rows_per_user)
+    print(f"{result['users']:,} users: generated in {result['generate_seconds']:.1f}s, "
+          f"migrated in {result['migrate_seconds']:.1f}s")
+    print(f"{'table':>10} {'rows':>6} {'total':>10} | {'shared CSV':>11} | {'store':>8} {'p95':>8}")
+    for r in result["rows"]:
+        limit = "all" if r["limit"] is None else f"{r['limit']}"
+        print(f"{r['table']:>10} {limit:>6} {r['total_rows']:>10,} | {r['csv_ms']:>9.1f}ms | "
+              f"{r['store_ms']:>6.2f}ms {r['store_p95_ms']:>6.2f}ms")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
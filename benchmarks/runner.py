@@ -0,0 +1,102 @@
+# benchmarks/runner.py
+import fnmatch
+import json
+import logging
+import os
+import platform
+import statistics
+import tempfile
+import time
+
+from benchmarks.cases import CASES, Sandbox
+
+DEFAULT_SIZES = (1_000, 10_000)
+
+# -------------------------
+# Run
+# -------------------------
+def _time(fn, repeat):
+    fn()  # warm-up: imports, caches, first-touch allocations
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run(sizes=DEFAULT_SIZES, repeat=5, select="*", seed=0, log=print):
+    """
+    Time every case matching `select` (a glob on case names) at every
+    dataset size. Returns a JSON-serialisable result document.
+    """
+    results = []
+    # Tab helpers call st.* outside a script run; keep Streamlit's warnings quiet
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory(prefix="mindsync-bench-") as tmp:
+        for size in sizes:
+            log(f"-- size {size:,}: building synthetic data")
+            sandbox = Sandbox(os.path.join(tmp, str(size)), size, seed=seed)
+            with sandbox.active():
+                for name, (setup, case_repeat) in CASES.items():
+                    if not fnmatch.fnmatch(name, select):
+                        continue
+                    n = case_repeat or repeat
+                    samples = _time(setup(sandbox), n)
+                    row = {
+                        "case": name,
+                        "size": size,
+                        "repeat": n,
+                        "min_s": min(samples),
+                        "median_s": statistics.median(samples),
+                        "mean_s": statistics.fmean(samples),
+                    }
+                    results.append(row)
+                    log(f"{name:<36} {size:>10,} {row['median_s'] * 1000:>12.3f} ms")
+    logging.disable(logging.NOTSET)
+
+    return {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def save(doc, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2)
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+# -------------------------
+# Compare
+# -------------------------
+def compare(current, baseline, threshold=0.2):
+    """
+    Median-time ratio of every (case, size) present in both documents.
+    A ratio above 1 + threshold is flagged as a regression.
+    """
+    base = {(r["case"], r["size"]): r for r in baseline["results"]}
+    rows = []
+    for r in current["results"]:
+        b = base.get((r["case"], r["size"]))
+        if b is None:
+            continue
+        ratio = r["median_s"] / b["median_s"] if b["median_s"] else float("inf")
+        rows.append({
+            "case": r["case"],
+            "size": r["size"],
+            "baseline_ms": b["median_s"] * 1000,
+            "current_ms": r["median_s"] * 1000,
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return rows
@@ -0,0 +1,104 @@
+# benchmarks/synthetic.py
+import numpy as np
+import pandas as pd
+
+# -------------------------
+# Synthetic Community & History Data
+# -------------------------
+# Shapes and value ranges follow data/*.csv so every loader and page can
+# run unchanged on them; the numbers are only realistic enough to time.
+GENDERS = ["Female", "Male", "Non-binary/Other"]
+OCCUPATIONS = ["Employed", "Student", "Self-employed", "Unemployed", "Retired"]
+WORK_MODES = ["Remote", "Hybrid", "In-person"]
+ACTIVITY_CATEGORIES = ["Relaxation", "Digital", "Physical", "Social", "Creative"]
+
+
+def community_frame(n, seed=0, first_id=1):
+    """n rows with the columns of data/kaggle.csv."""
+    rng = np.random.default_rng(seed)
+    work = rng.gamma(1.3, 1.7, n).clip(0, 12)
+    leisure = rng.normal(6.8, 2.2, n).clip(0, 14)
+    sleep = rng.normal(7.0, 0.85, n).clip(3, 10)
+    stress = rng.normal(8.1, 2.1, n).clip(0, 10)
+    productivity = rng.normal(54, 15, n).clip(0, 100)
+    screen = work + leisure
+    wellness = (100 - 4 * screen - 5 * stress + 6 * (sleep - 7) + 0.3 * productivity
+                + rng.normal(0, 8, n)).clip(0, 100)
+    return pd.DataFrame({
+        "user_id": [f"U{i:08d}" for i in range(first_id, first_id + n)],
+        "age": rng.integers(16, 61, n),
+        "gender": rng.choice(GENDERS, n, p=[0.55, 0.43, 0.02]),
+        "occupation": rng.choice(OCCUPATIONS, n, p=[0.52, 0.27, 0.11, 0.07, 0.03]),
+        "work_mode": rng.choice(WORK_MODES, n, p=[0.37, 0.37, 0.26]),
+        "screen_time_hours": screen.round(2),
+        "work_screen_hours": work.round(2),
+        "leisure_screen_hours": leisure.round(2),
+        "sleep_hours": sleep.round(2),
+        "sleep_quality_1_5": rng.integers(1, 5, n),
+        "stress_level_0_10": stress.round(1),
+        "productivity_0_100": productivity.round(1),
+        "exercise_minutes_per_week": rng.gamma(2.4, 46, n).astype(int),
+        "social_hours_per_week": rng.gamma(2.6, 3, n).round(1),
+        "mental_wellness_index_0_100": wellness.round(1),
+    })
+
+
+def _timestamps(n, rng, start="2024-01-01"):
+    offsets = np.sort(rng.integers(0, 3600 * 24 * 365 * 2, n))
+    return (pd.Timestamp(start) + pd.to_timedelta(offsets, unit="s")).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def daily_history(n, seed=0):
+    """n rows with the columns of data/user_daily_data.csv."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "date": _timestamps(n, rng),
+        "screen_time_hours": rng.choice(np.arange(0, 20.5, 0.5), n),
+        "work_screen_hours": rng.choice(np.arange(0, 12.5, 0.5), n),
+        "leisure_screen_hours": rng.choice(np.arange(0, 12.5, 0.5), n),
+        "sleep_hours": rng.choice(np.arange(3, 12.5, 0.5), n),
+        "sleep_quality": rng.integers(1, 11, n).astype(float),
+        "exercise_minutes": rng.integers(0, 300, n).astype(float),
+        "social_hours": rng.integers(0, 30, n).astype(float),
+        "stress_level": rng.integers(0, 11, n).astype(float),
+        "productivity": rng.integers(0, 101, n).astype(float),
+        "predicted_wellness": rng.uniform(0, 100, n),
+    })
+
+
+def activities(n, seed=0):
+    """n rows with the columns of data/activities.csv."""
+    rng = np.random.default_rng(seed)
+    created = _timestamps(n, rng)
+    return pd.DataFrame({
+        "tanggal": [c[:10] for c in created],
+        "aktivitas": rng.choice(["Meditasi & Mindfulness", "Digital Detox (no gadget)", "Membaca Buku (non-digital)"], n),
+        "kategori": rng.choice(ACTIVITY_CATEGORIES, n),
+        "durasi": rng.integers(5, 180, n),
+        "intensitas": rng.integers(1, 6, n),
+        "catatan": rng.choice(["", "Catatan singkat"], n),
+        "created_at": created,
+    })
+
+
+def compass_history(n, seed=0):
+    """n rows with the columns of data/digital_compass_data.csv."""
+    rng = np.random.default_rng(seed)
+    platforms = ["instagram", "tiktok", "youtube", "facebook", "twitter",
+                 "whatsapp", "snapchat", "discord", "linkedin", "other"]
+    categories = ["anxiety", "fomo", "social_comparison", "validation_seeking",
+                  "habit_formation", "mindless_consumption", "self_esteem"]
+    usage = {f"{p}_mins": rng.integers(0, 120, n) for p in platforms}
+    scores = {f"{c}_score": rng.uniform(1, 8, n) for c in categories}
+    total_usage = sum(usage.values())
+    wellness = rng.uniform(20, 95, n).round(1)
+    return pd.DataFrame({
+        "date": _timestamps(n, rng),
+        "digital_wellness_score": wellness,
+        "wellness_level": np.where(wellness >= 75, "Healthy", np.where(wellness >= 60, "Moderate", "Concerning")),
+        "total_fomo_score": sum(scores.values()),
+        "total_daily_usage_mins": total_usage,
+        "total_platforms_used": sum((u > 0).astype(int) for u in usage.values()),
+        **usage,
+        **scores,
+    })
@@ -0,0 +1,68 @@
+# benchmarks/violin_report.py
+"""
+Wellness Map violin payload: px.violin(points="all") over every row versus
+the server-side density, box and stratified sample.
+
+    python -m benchmarks.violin_report --sizes 400 10000 100000 1000000
+"""
+import argparse
+import json
+import time
+
+import plotly.express as px
+
+from benchmarks import synthetic
+from benchmarks.cases import REPO_DIR  # noqa: F401  (puts the repo on sys.path)
+from community_violin import build_violin, payload_bytes, violin_figure
+
+
+def raw_violin_figure(df):
+    # What tab3_welness_map drew before
+    return px.violin(df, y="mental_wellness_index_0_100", box=True, points="all",
+                     title="Distribusi Kesejahteraan Mental Komunitas")
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def report(sizes):
+    rows = []
+    for size in sizes:
+        df = synthetic.community_frame(size, seed=size)
+        raw, raw_seconds = _timed(lambda: raw_violin_figure(df))
+        summary, build_seconds = _timed(lambda: build_violin(df))
+        binned, draw_seconds = _timed(lambda: violin_figure(summary))
+        rows.append({
+            "rows": size,
+            "raw_bytes": payload_bytes(raw),
+            "raw_seconds": raw_seconds,
+            "binned_bytes": payload_bytes(binned),
+            "build_seconds": build_seconds,
+            "draw_seconds": draw_seconds,
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[400, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--out", help="also save the rows as JSON")
+    args = parser.parse_args(argv)
+
+    rows = report(args.sizes)
+    print(f"{'rows':>12} | {'px.violin':>12} | {'binned':>10} | {'build (once)':>12} {'draw':>8}")
+    for r in rows:
+        print(
+            f"{r['rows']:>12,} | {r['raw_bytes'] / 1024:>9.1f} KB | {r['binned_bytes'] / 1024:>7.1f} KB | "
+            f"{r['build_seconds'] * 1000:>10.1f}ms {r['draw_seconds'] * 1000:>6.1f}ms"
+        )
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
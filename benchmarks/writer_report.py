@@ -0,0 +1,109 @@
+# benchmarks/writer_report.py
+"""
+Concurrent saves: one transaction per save from every session thread
+versus the history store's batched writer, with a lost-row check.
+
+    python -m benchmarks.writer_report --threads 32 --saves 200 --fsync commit
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+import history_store
+
+
+def _row(thread, i):
+    return {
+        "date": f"2025-11-20 {thread % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}",
+        "screen_time_hours": 8.0, "sleep_hours": 7.0, "stress_level": 5.0,
+        "productivity": 70.0, "predicted_wellness": 53.7,
+    }
+
+
+def _run(save, threads, saves):
+    # Every thread is one session clicking Save `saves` times
+    latencies = [[] for _ in range(threads)]
+
+    def session(t):
+        for i in range(saves):
+            start = time.perf_counter()
+            save(_row(t, i), f"user{t:04d}")
+            latencies[t].append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=session, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    clicks = time.perf_counter() - start
+    history_store.flush()
+    durable = time.perf_counter() - start
+    ms = np.concatenate(latencies) * 1000
+    return {
+        "click_p50_ms": float(np.percentile(ms, 50)),
+        "click_p99_ms": float(np.percentile(ms, 99)),
+        "saves_per_second": threads * saves / durable,
+        "clicks_seconds": clicks,
+        "durable_seconds": durable,
+    }
+
+
+def report(threads, saves, fsync="checkpoint"):
+    history_store.set_fsync_policy(fsync)
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="mindsync-writer-") as tmp:
+        saved = history_store.DATA_DIR
+        history_store.DATA_DIR = tmp  # nothing to migrate
+        synchronous = history_store.FSYNC_POLICIES[fsync]
+        try:
+            for mode in ("direct", "batched"):
+                db = os.path.join(tmp, f"{mode}.db")
+                if mode == "direct":
+                    def save(row, user, db=db):
+                        conn = history_store.connect(db)
+                        conn.execute(f"PRAGMA synchronous={synchronous}")
+                        history_store.insert("daily", [row], user, path=db)
+                else:
+                    def save(row, user, db=db):
+                        history_store.submit("daily", [row], user, path=db)
+                result = _run(save, threads, saves)
+                stored = history_store.connect(db).execute("SELECT COUNT(*) FROM daily").fetchone()[0]
+                result.update(mode=mode, stored=stored, lost=threads * saves - stored)
+                rows.append(result)
+        finally:
+            history_store.close_all()
+            history_store.DATA_DIR = saved
+    return {"threads": threads, "saves": saves, "fsync": fsync, "rows": rows,
+            "writer": history_store.writer_stats()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--saves", type=int, default=200, help="saves per thread")
+    parser.add_argument("--fsync", choices=sorted(history_store.FSYNC_POLICIES), default="checkpoint")
+    parser.add_argument("--out", help="also save the results as JSON")
+    args = parser.parse_args(argv)
+
+    result = report(args.threads, args.saves, args.fsync)
+    print(f"{result['threads']} sessions × {result['saves']} saves, fsync={result['fsync']}")
+    print(f"{'mode':>8} | {'click p50':>10} {'p99':>9} | {'saves/s':>9} | {'lost':>5}")
+    for r in result["rows"]:
+        print(f"{r['mode']:>8} | {r['click_p50_ms']:>8.3f}ms {r['click_p99_ms']:>7.2f}ms | "
+              f"{r['saves_per_second']:>9,.0f} | {r['lost']:>5}")
+    w = result["writer"]
+    print(f"writer: {w['batches']} commits, {w['rows_per_batch']} rows/commit, "
+          f"flush p50 {w['flush_ms_p50']:.1f} ms p95 {w['flush_ms_p95']:.1f} ms")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
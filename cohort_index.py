@@ -0,0 +1,127 @@
+# cohort_index.py
+import numpy as np
+import pandas as pd
+
+from community_aggregates import build_aggregates
+from community_rank import SortedIndex
+from quantile_sketch import sketch_frame
+
+# -------------------------
+# Cohort Definitions
+# -------------------------
+# The sidebar profile (age, gender, occupation, work_mode) picks a cohort.
+# Cohorts are tried from finest to coarsest; the first one with enough
+# members is used, so small cells fall back to a broader "people like you".
+AGE_EDGES = [0, 18, 25, 35, 45, 55, np.inf]
+AGE_BANDS = ["<18", "18-24", "25-34", "35-44", "45-54", "55+"]
+
+COHORT_LEVELS = [
+    ("age_band", "gender", "occupation", "work_mode"),
+    ("age_band", "occupation", "work_mode"),
+    ("age_band", "occupation"),
+    ("occupation", "work_mode"),
+    ("occupation",),
+    ("age_band",),
+]
+MIN_COHORT_SIZE = 30
+
+# Sidebar choices that are spelled differently in the community data
+PROFILE_ALIASES = {
+    "gender": {"Other": "Non-binary/Other"},
+    "occupation": {"Freelancer": "Self-employed"},
+}
+
+
+def age_band(age):
+    """Band label for one age, or None when it is missing."""
+    if age is None or pd.isna(age):
+        return None
+    return AGE_BANDS[int(np.searchsorted(AGE_EDGES, float(age), side="right")) - 1]
+
+
+def profile_key(profile):
+    """Cohort dimensions of a sidebar `user_profile` dict."""
+    profile = profile or {}
+    key = {"age_band": age_band(profile.get("age"))}
+    for dim in ("gender", "occupation", "work_mode"):
+        value = profile.get(dim)
+        key[dim] = PROFILE_ALIASES.get(dim, {}).get(value, value)
+    return key
+
+
+def cohort_label(dimensions, values):
+    parts = []
+    for dim, value in zip(dimensions, values):
+        parts.append(f"{value} tahun" if dim == "age_band" else str(value))
+    return " • ".join(parts)
+
+# -------------------------
+# Cohort Index
+# -------------------------
+class CohortIndex:
+    """
+    Aggregates and a percentile index for every cohort at every level,
+    computed once per data version. A lookup is a few dict probes; the
+    community DataFrame is never filtered at render time.
+
+    Every level partitions the community again, so exact indexes hold one
+    sorted copy of the score columns per level. Above `exact_rows`
+    community rows each cohort gets a quantile sketch instead, like the
+    community-wide rank index in resources.
+    """
+
+    def __init__(self, df, levels=COHORT_LEVELS, min_size=MIN_COHORT_SIZE, exact_rows=None):
+        self.levels = [tuple(level) for level in levels]
+        self.min_size = min_size
+        self._cohorts = {}
+        if df is None or df.empty:
+            return
+        rank_index = SortedIndex if exact_rows is None or len(df) <= exact_rows else sketch_frame
+
+        keys = pd.DataFrame(index=df.index)
+        if "age" in df.columns:
+            keys["age_band"] = pd.cut(
+                pd.to_numeric(df["age"], errors="coerce"), AGE_EDGES, labels=AGE_BANDS, right=False
+            ).astype(object)
+        for dim in ("gender", "occupation", "work_mode"):
+            if dim in df.columns:
+                keys[dim] = df[dim].astype(object)
+
+        for level in self.levels:
+            if not all(dim in keys.columns for dim in level):
+                continue
+            groups = keys.groupby(list(level), observed=True, dropna=True, sort=False).indices
+            for values, positions in groups.items():
+                values = values if isinstance(values, tuple) else (values,)
+                if len(positions) < self.min_size:
+                    continue
+                members = df.iloc[positions]
+                self._cohorts[(level, tuple(str(v) for v in values))] = {
+                    "dimensions": level,
+                    "label": cohort_label(level, values),
+                    "rows": int(len(positions)),
+                    "aggregates": build_aggregates(members),
+                    "rank": rank_index(members),
+                }
+
+    def __len__(self):
+        return len(self._cohorts)
+
+    @property
+    def nbytes(self):
+        return sum(c["rank"].nbytes for c in self._cohorts.values())
+
+    def lookup(self, profile):
+        """
+        Finest cohort matching `profile` with at least `min_size` members,
+        or None when only the whole community is large enough.
+        """
+        key = profile_key(profile)
+        for level in self.levels:
+            values = tuple(key.get(dim) for dim in level)
+            if any(v is None for v in values):
+                continue
+            cohort = self._cohorts.get((level, tuple(str(v) for v in values)))
+            if cohort is not None:
+                return cohort
+        return None
@@ -0,0 +1,140 @@
+# columnar_cache.py
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from model_store import file_digest
+from utils import load_data
+
+# -------------------------
+# Cache Location
+# -------------------------
+# One directory per (CSV, content hash) holding one .npy per column, so
+# a load is a handful of memory-mapped opens instead of a CSV parse.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, "data", ".columnar")
+
+# Columns whose float64 values must survive exactly (the model target)
+KEEP_FLOAT64 = ("mental_wellness_index_0_100",)
+
+# Text columns with at most this share of distinct values become categorical
+CATEGORY_RATIO = 0.5
+
+
+def cache_dir(path, cache_root=CACHE_DIR):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_root, f"{name}-{file_digest(path)[:16]}")
+
+# -------------------------
+# Dtype Compaction
+# -------------------------
+def compact_frame(df, keep_float64=KEEP_FLOAT64):
+    """
+    Smallest lossless-enough dtypes: ints downcast to the narrowest width,
+    floats to float32 (trees compare features in float32 anyway), and
+    low-cardinality text to categoricals. `keep_float64` columns stay as-is.
+    """
+    out = {}
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_integer_dtype(s):
+            out[col] = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_float_dtype(s):
+            out[col] = s if col in keep_float64 else s.astype(np.float32)
+        elif pd.api.types.is_bool_dtype(s):
+            out[col] = s
+        elif s.nunique(dropna=False) <= max(1, CATEGORY_RATIO * len(s)):
+            out[col] = s.astype("category")
+        else:
+            out[col] = s
+    return pd.DataFrame(out, index=df.index)
+
+# -------------------------
+# Write & Read
+# -------------------------
+def write_cache(df, folder):
+    """Write a compacted frame as per-column .npy files, published atomically."""
+    parent = os.path.dirname(folder)
+    os.makedirs(parent, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(prefix=".columnar-", dir=parent)
+    columns = []
+    try:
+        for i, col in enumerate(df.columns):
+            s = df[col]
+            entry = {"name": col, "file": f"c{i}.npy"}
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                entry["kind"] = "category"
+                entry["categories"] = [str(c) for c in s.cat.categories]
+                values = s.cat.codes.to_numpy()
+            elif pd.api.types.is_numeric_dtype(s) or pd.api.types.is_bool_dtype(s):
+                entry["kind"] = "numeric"
+                values = s.to_numpy()
+            else:
+                # Fixed-width unicode keeps the file memory-mappable
+                entry["kind"] = "string"
+                entry["na"] = s.isna().to_numpy().tolist() if s.isna().any() else None
+                values = s.fillna("").astype(str).to_numpy().astype("U")
+            np.save(os.path.join(tmp_dir, entry["file"]), values)
+            columns.append(entry)
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"rows": len(df), "columns": columns}, f)
+        os.replace(tmp_dir, folder)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.isdir(folder):
+            raise
+    return folder
+
+
+def read_cache(folder, mmap_mode="r"):
+    """Rebuild the frame from a cache directory; numeric data stays memory-mapped."""
+    with open(os.path.join(folder, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    data = {}
+    for entry in meta["columns"]:
+        values = np.load(os.path.join(folder, entry["file"]), mmap_mode=mmap_mode)
+        if entry["kind"] == "category":
+            data[entry["name"]] = pd.Categorical.from_codes(values, entry["categories"])
+        elif entry["kind"] == "string":
+            s = pd.Series(values.astype(str))
+            if entry.get("na"):
+                s[np.asarray(entry["na"])] = None
+            data[entry["name"]] = s
+        else:
+            data[entry["name"]] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def _drop_stale(path, keep):
+    name = os.path.splitext(os.path.basename(path))[0]
+    cache_root = os.path.dirname(keep)
+    for entry in os.listdir(cache_root):
+        full = os.path.join(cache_root, entry)
+        if entry.startswith(f"{name}-") and full != keep:
+            shutil.rmtree(full, ignore_errors=True)
+
+# -------------------------
+# Public Loader
+# -------------------------
+def load_compact(path="data/kaggle.csv", cache_root=CACHE_DIR):
+    """
+    Community DataFrame with compact dtypes.
+    Reads the memory-mapped columnar cache when it matches the CSV's
+    content hash; otherwise parses the CSV, converts it once and drops
+    caches of older versions.
+    """
+    folder = cache_dir(path, cache_root)
+    if os.path.exists(os.path.join(folder, "meta.json")):
+        return read_cache(folder)
+
+    df = compact_frame(load_data(path))
+    try:
+        write_cache(df, folder)
+        _drop_stale(path, folder)
+    except OSError:
+        return df  # read-only checkout: serve the parsed frame
+    return read_cache(folder)
@@ -0,0 +1,55 @@
+# community_aggregates.py
+import numpy as np
+import pandas as pd
+
+from streaming_stats import CATEGORY_COLUMNS, MEAN_COLUMNS
+
+# -------------------------
+# Community Aggregates
+# -------------------------
+# Everything the Wellness Map shows about the community, computed once per
+# data version. The page reads this small dict instead of scanning the
+# DataFrame, so its render cost no longer grows with the community size.
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+HIST_BINS = 30
+
+
+def _column_stats(s):
+    values = s.to_numpy(dtype=np.float64, na_value=np.nan)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return None
+    counts, edges = np.histogram(values, bins=HIST_BINS)
+    return {
+        # pandas reductions, so numbers match what the page used to compute
+        "mean": float(s.mean()),
+        "std": float(s.std()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "quantiles": {str(q): float(v) for q, v in zip(QUANTILES, np.quantile(values, QUANTILES))},
+        "hist": {"edges": edges.tolist(), "counts": counts.tolist()},
+    }
+
+
+def build_aggregates(df, columns=MEAN_COLUMNS, category_columns=CATEGORY_COLUMNS):
+    """
+    Per-column mean, std, min/max, quantiles and histogram, plus category
+    counts, for every community column the Wellness Map uses.
+    """
+    stats = {}
+    for col in columns:
+        if col in df.columns:
+            col_stats = _column_stats(df[col])
+            if col_stats is not None:
+                stats[col] = col_stats
+    categories = {
+        col: {str(k): int(v) for k, v in df[col].value_counts().items()}
+        for col in category_columns if col in df.columns
+    }
+    return {"rows": int(len(df)), "columns": stats, "categories": categories}
+
+
+def column_mean(aggregates, column, default=None):
+    """Mean of a community column, or `default` when it is not available."""
+    col_stats = aggregates["columns"].get(column) if aggregates else None
+    return col_stats["mean"] if col_stats else default
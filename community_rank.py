@@ -0,0 +1,63 @@
+# community_rank.py
+import numpy as np
+
+from streaming_stats import MEAN_COLUMNS
+
+# -------------------------
+# Sorted Community Index
+# -------------------------
+# One sorted copy of each community column. "Share of members below x"
+# is then a binary search instead of a full boolean scan per render:
+#
+#     (df[col] < x).mean()  ==  searchsorted(sorted_col, x, "left") / len(df)
+#
+# NaNs never compare below x, so they are left out of the sorted array
+# but still counted in the denominator, exactly like the scan.
+class SortedIndex:
+    def __init__(self, df, columns=MEAN_COLUMNS):
+        self.rows = len(df)
+        self._sorted = {}
+        for col in columns:
+            if col in df.columns:
+                values = df[col].to_numpy()
+                if values.dtype.kind not in "iuf":
+                    continue
+                if values.dtype.kind == "f":
+                    values = values[~np.isnan(values)]
+                self._sorted[col] = np.sort(values, kind="stable")
+        self._widened = {}
+
+    # Exact: a binary search over every value (see quantile_sketch for ± bounds)
+    rank_error = 0.0
+
+    @property
+    def columns(self):
+        return list(self._sorted)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in self._sorted.values())
+
+    def _array_for(self, col, x):
+        arr = self._sorted[col]
+        # Same comparison dtype the scan would use (NEP 50: Python scalars
+        # adopt the column's dtype, NumPy float64 scalars widen it)
+        dtype = np.result_type(arr, x)
+        if dtype == arr.dtype:
+            return arr, dtype
+        key = (col, dtype)
+        if key not in self._widened:
+            self._widened[key] = arr.astype(dtype)
+        return self._widened[key], dtype
+
+    def percentile(self, col, x):
+        """Percent of community members with `col` strictly below x."""
+        if not self.rows:
+            return 0.0
+        arr, dtype = self._array_for(col, x)
+        below = np.searchsorted(arr, np.asarray(x, dtype=dtype), side="left")
+        return float(below / self.rows * 100)
+
+    def percentiles(self, values):
+        """{column: percentile} for every indexed column in `values`."""
+        return {col: self.percentile(col, x) for col, x in values.items() if col in self._sorted}
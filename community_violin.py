@@ -0,0 +1,119 @@
+# community_violin.py
+import numpy as np
+import plotly.graph_objects as go
+
+from streaming_stats import WELLNESS_COLUMN
+
+# -------------------------
+# Server-side Violin
+# -------------------------
+# px.violin(points="all") sends every community row to the browser and
+# has it compute the density there. Instead the density, the box and a
+# fixed-size sample of points are computed once per data version, so the
+# chart payload stays the same size however large the community grows.
+KDE_POINTS = 128
+KDE_BINS = 512
+SAMPLE_SIZE = 500
+STRATA = 20
+VIOLIN_COLOR = "#636efa"  # plotly's first default colour, as px.violin used
+
+
+def _bandwidth(values):
+    # Silverman's rule, the default of plotly's client-side violin
+    std = values.std(ddof=1) if values.size > 1 else 0.0
+    q1, q3 = np.quantile(values, [0.25, 0.75])
+    spread = min(std, (q3 - q1) / 1.349) or std or 1.0
+    return 1.059 * spread * values.size ** -0.2
+
+
+def _kde(values, lo, hi):
+    """Gaussian KDE on KDE_POINTS grid points, from a KDE_BINS histogram."""
+    grid = np.linspace(lo, hi, KDE_POINTS)
+    if hi <= lo:
+        return grid, np.ones_like(grid)
+    counts, edges = np.histogram(values, bins=KDE_BINS, range=(lo, hi))
+    centers = (edges[:-1] + edges[1:]) / 2
+    bw = _bandwidth(values)
+    z = (grid[:, None] - centers[None, :]) / bw
+    density = (np.exp(-0.5 * z * z) * counts[None, :]).sum(axis=1)
+    return grid, density / (values.size * bw * np.sqrt(2 * np.pi))
+
+
+def _stratified_sample(values, size, seed):
+    """
+    Up to `size` values, allocated across equal-width value strata in
+    proportion to their counts (at least one from every non-empty stratum,
+    so the tails stay visible).
+    """
+    if values.size <= size:
+        return values.copy()
+    rng = np.random.default_rng(seed)
+    edges = np.linspace(values.min(), values.max(), STRATA + 1)
+    stratum = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, STRATA - 1)
+    counts = np.bincount(stratum, minlength=STRATA)
+    alloc = np.maximum(np.floor(counts / values.size * size), np.minimum(counts, 1)).astype(np.int64)
+    # Random order within each stratum; take the first alloc[s] of each
+    order = np.lexsort((rng.random(values.size), stratum))
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank_in_stratum = np.arange(values.size) - starts[stratum[order]]
+    return values[order[rank_in_stratum < alloc[stratum[order]]]]
+
+
+def build_violin(df, column=WELLNESS_COLUMN, sample_size=SAMPLE_SIZE, seed=0):
+    """Density, box statistics and a stratified point sample of one column."""
+    values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return None
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    lo, hi = float(values.min()), float(values.max())
+    grid, density = _kde(values, lo, hi)
+    return {
+        "column": column,
+        "rows": int(values.size),
+        "grid": np.round(grid, 3).tolist(),
+        "density": np.round(density / density.max(), 4).tolist(),
+        "box": {
+            "q1": float(q1), "median": float(median), "q3": float(q3),
+            # Whiskers end at the furthest values within 1.5 IQR, like plotly's
+            "lowerfence": float(values[values >= q1 - 1.5 * iqr].min()),
+            "upperfence": float(values[values <= q3 + 1.5 * iqr].max()),
+        },
+        "points": np.round(_stratified_sample(values, sample_size, seed), 3).tolist(),
+    }
+
+
+def violin_figure(summary, title=None, seed=0):
+    """Violin drawn from a build_violin summary: outline, box and sampled points."""
+    # float32 arrays go over the wire base64-encoded, not as JSON numbers
+    grid = np.asarray(summary["grid"], dtype=np.float32)
+    half = (0.4 * np.asarray(summary["density"])).astype(np.float32)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=np.concatenate([half, -half[::-1]]), y=np.concatenate([grid, grid[::-1]]),
+        fill="toself", mode="lines", line=dict(color=VIOLIN_COLOR, width=1.5),
+        fillcolor="rgba(99, 110, 250, 0.5)", hoverinfo="skip", name="",
+    ))
+    box = summary["box"]
+    fig.add_trace(go.Box(
+        x=[0], q1=[box["q1"]], median=[box["median"]], q3=[box["q3"]],
+        lowerfence=[box["lowerfence"]], upperfence=[box["upperfence"]],
+        width=0.08, marker_color=VIOLIN_COLOR, fillcolor="rgba(255, 255, 255, 0.25)",
+        hoverinfo="y", name="",
+    ))
+    points = np.asarray(summary["points"], dtype=np.float32)
+    jitter = np.random.default_rng(seed).uniform(-0.08, 0.08, points.size).astype(np.float32)
+    fig.add_trace(go.Scatter(
+        x=-0.6 + jitter, y=points, mode="markers",
+        marker=dict(color=VIOLIN_COLOR, size=4, opacity=0.6),
+        hovertemplate="%{y}<extra></extra>", name="",
+    ))
+    fig.update_layout(title=title, showlegend=False)
+    fig.update_xaxes(showticklabels=False, range=[-0.9, 0.5], zeroline=False)
+    return fig
+
+
+def payload_bytes(fig):
+    """Size of the figure JSON that st.plotly_chart sends to the browser."""
+    return len(fig.to_json().encode("utf-8"))
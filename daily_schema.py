@@ -0,0 +1,215 @@
+# daily_schema.py
+"""
+Typed ingestion for user_daily_data.csv: detect each row's schema from its
+width, remap legacy rows, coerce dtypes and quarantine what cannot be read.
+
+    python -m daily_schema data/user_daily_data.csv
+"""
+import argparse
+import csv
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# -------------------------
+# Schema Versions
+# -------------------------
+# v1 rows (9 fields) predate exercise_minutes and social_hours. Appended
+# under the v2 header, they read as shifted: stress_level lands in
+# exercise_minutes, predicted_wellness in stress_level and the last two
+# fields are empty. Files may carry leading columns (e.g. username) before
+# "date"; the header tells how many.
+SCHEMAS = {
+    "v1": [
+        "date", "screen_time_hours", "work_screen_hours", "leisure_screen_hours",
+        "sleep_hours", "sleep_quality", "stress_level", "productivity", "predicted_wellness",
+    ],
+    "v2": [
+        "date", "screen_time_hours", "work_screen_hours", "leisure_screen_hours",
+        "sleep_hours", "sleep_quality", "exercise_minutes", "social_hours",
+        "stress_level", "productivity", "predicted_wellness",
+    ],
+}
+COLUMNS = SCHEMAS["v2"]
+NUMERIC_COLUMNS = COLUMNS[1:]
+
+DATE_FORMATS = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d"]
+TIME_FORMAT = DATE_FORMATS[0]
+
+# Inclusive bounds; values outside them quarantine the row
+BOUNDS = {col: (0, 24) for col in NUMERIC_COLUMNS if col.endswith("_hours")}
+BOUNDS.update({
+    "sleep_quality": (0, 10),
+    "exercise_minutes": (0, 1440),
+    "stress_level": (0, 10),
+    "productivity": (0, 100),
+    "predicted_wellness": (0, 100),
+})
+
+QUARANTINE_SUFFIX = ".quarantine.csv"
+
+# -------------------------
+# Repair
+# -------------------------
+# Rows imported before this module existed are stored shifted; these
+# helpers find and remap them in a frame that already has v2 columns.
+def shifted_rows(df):
+    """Mask of v1 rows read under v2 columns: the two trailing fields empty, the rest filled."""
+    filled = df[COLUMNS[:len(SCHEMAS["v1"])]].notna().all(axis=1)
+    return filled & df["productivity"].isna() & df["predicted_wellness"].isna()
+
+
+def repair_frame(df):
+    """Move shifted v1 values back to their own columns; returns (frame, rows repaired)."""
+    mask = shifted_rows(df)
+    n = int(mask.sum())
+    if n:
+        df = df.copy()
+        values = df.loc[mask, COLUMNS[:len(SCHEMAS["v1"])]].to_numpy()
+        df.loc[mask, NUMERIC_COLUMNS] = np.nan
+        df.loc[mask, SCHEMAS["v1"]] = values
+    return df, n
+
+# -------------------------
+# Validation
+# -------------------------
+def _read_fields(path, width, text_columns):
+    # The C parser fills short rows with NaN; a row longer than `width`
+    # raises, and the caller retries with the file's real maximum
+    return pd.read_csv(
+        path, header=None, skiprows=1, names=range(width), dtype={i: object for i in range(text_columns)},
+        keep_default_na=False, na_values=[""], skip_blank_lines=True, low_memory=False,
+    )
+
+
+def _read_raw(path, header, text_columns):
+    try:
+        return _read_fields(path, len(header) + 1, text_columns)
+    except pd.errors.ParserError:
+        lines = pd.read_csv(
+            path, sep="\x1f", header=None, names=["raw"], dtype=str,
+            quoting=csv.QUOTE_NONE, na_filter=False, skiprows=1,
+        )["raw"]
+        return _read_fields(path, int(lines.str.count(",").max()) + 1, text_columns)
+
+
+def _parse_dates(values):
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    for fmt in DATE_FORMATS:
+        todo = parsed.isna()
+        if not todo.any():
+            break
+        parsed[todo] = pd.to_datetime(values[todo], format=fmt, errors="coerce")
+    return parsed
+
+
+def validate_csv(path):
+    """
+    Read a daily CSV of any schema version. Returns (clean, quarantine,
+    counts): clean rows in v2 columns (plus the file's leading columns)
+    with dates normalised to TIME_FORMAT; quarantined rows with their line
+    number, the first check they failed and their fields as read.
+    """
+    with open(path, encoding="utf-8") as f:
+        header = f.readline().rstrip("\r\n").split(",")
+    if "date" not in header:
+        raise ValueError(f"{path}: no date column in header")
+    p = header.index("date")
+    if header[p:] not in SCHEMAS.values():
+        raise ValueError(f"{path}: unknown daily schema {header[p:]}")
+    prefix = header[:p]
+
+    fields = _read_raw(path, header, p + 1)  # leading columns and date stay text
+    # Width up to the last non-empty field, so v1 rows padded with empty
+    # trailing fields count as v1 as well
+    filled = fields.notna().to_numpy()
+    widths = pd.Series(filled.shape[1] - filled[:, ::-1].argmax(axis=1), index=fields.index)
+    widths[~filled.any(axis=1)] = 0
+
+    # Each column takes its field position from the row's schema version
+    sources = {col: [] for col in COLUMNS}
+    counts = {}
+    low = 0
+    for version, columns in SCHEMAS.items():
+        mask = (widths > low) & (widths <= p + len(columns))
+        counts[version] = int(mask.sum())
+        for i, col in enumerate(columns):
+            sources[col].append((mask, fields[p + i]))
+        low = p + len(columns)
+    reason = np.full(len(fields), "", dtype=object)
+    ok = np.ones(len(fields), dtype=bool)
+
+    def reject(cond, why):
+        # The first failure is the one reported
+        cond = ok & np.asarray(cond)
+        reason[cond] = why
+        ok[cond] = False
+
+    reject(widths > low, "too many fields")
+
+    clean = fields[list(range(p))].set_axis(prefix, axis=1)
+    for col, picks in sources.items():
+        values = pd.Series(np.nan, index=fields.index, dtype=object if col == "date" else float)
+        for mask, field in picks:
+            values = values.where(~mask, field)
+        clean[col] = values
+
+    dates = _parse_dates(clean["date"].astype(str))
+    reject(dates.isna(), "date")
+    clean["date"] = dates.dt.strftime(TIME_FORMAT)
+
+    for col in NUMERIC_COLUMNS:
+        values = pd.to_numeric(clean[col], errors="coerce")
+        reject(values.isna() & clean[col].notna(), col)
+        low, high = BOUNDS.get(col, (-np.inf, np.inf))
+        reject((values < low) | (values > high), f"{col} out of range")
+        clean[col] = values.astype(float)
+
+    bad = ~ok
+    counts["quarantined"] = int(bad.sum())
+    quarantine = pd.DataFrame({"line": fields.index[bad] + 2, "reason": reason[bad]})
+    if counts["quarantined"]:
+        raw = fields[bad].astype(object).where(fields[bad].notna(), "")
+        quarantine["raw"] = raw.astype(str).agg(",".join, axis=1).str.rstrip(",").to_numpy()
+    else:
+        quarantine["raw"] = pd.Series(dtype=object)
+    return clean[~bad].reset_index(drop=True), quarantine.reset_index(drop=True), counts
+
+
+def quarantine_path(csv_path):
+    return os.path.splitext(csv_path)[0] + QUARANTINE_SUFFIX
+
+
+def write_quarantine(quarantine, csv_path):
+    """Write the quarantined rows next to the source (removing a stale file when there are none)."""
+    path = quarantine_path(csv_path)
+    if quarantine.empty:
+        if os.path.exists(path):
+            os.remove(path)
+        return None
+    quarantine.to_csv(path, index=False)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("csv", help="daily CSV to validate")
+    parser.add_argument("--write-quarantine", action="store_true", help=f"save bad rows to *{QUARANTINE_SUFFIX}")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    clean, quarantine, counts = validate_csv(args.csv)
+    seconds = time.perf_counter() - start
+    print(f"{len(clean):,} clean rows in {seconds:.2f}s "
+          f"(v1 {counts['v1']:,} · v2 {counts['v2']:,} · "
+          f"quarantined {counts['quarantined']:,})")
+    for reason, n in quarantine["reason"].value_counts().items():
+        print(f"  {reason}: {n:,}")
+    if args.write_quarantine:
+        print(write_quarantine(quarantine, args.csv) or "nothing to quarantine")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# forest_predictor.py
+import os
+import time
+import warnings
+
+import numpy as np
+
+# -------------------------
+# Flat Forest Export
+# -------------------------
+# All trees of a fitted RandomForestRegressor are packed into one set of
+# node arrays. Leaves point to themselves with an infinite threshold, so
+# every row can walk every tree in lock-step for a fixed number of steps
+# (the deepest tree's depth) without per-tree Python loops.
+FLAT_FILE = "forest_flat.npz"
+
+
+def export_forest(model):
+    """Flatten a fitted single-output forest into contiguous node arrays."""
+    left, right, feature, threshold, value, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for est in model.estimators_:
+        tree = est.tree_
+        n = tree.node_count
+        is_leaf = tree.children_left == -1
+        own = np.arange(n, dtype=np.int64)
+
+        left.append(np.where(is_leaf, own, tree.children_left) + offset)
+        right.append(np.where(is_leaf, own, tree.children_right) + offset)
+        feature.append(np.where(is_leaf, 0, tree.feature).astype(np.int64))
+        threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+        value.append(tree.value[:, 0, 0].astype(np.float64))
+        roots.append(offset)
+        offset += n
+        max_depth = max(max_depth, tree.max_depth)
+
+    return {
+        "left": np.concatenate(left),
+        "right": np.concatenate(right),
+        "feature": np.concatenate(feature),
+        "threshold": np.concatenate(threshold),
+        "value": np.concatenate(value),
+        "roots": np.asarray(roots, dtype=np.int64),
+        "max_depth": np.int64(max_depth),
+        "n_features": np.int64(model.n_features_in_),
+    }
+
+# -------------------------
+# Fast Predictor
+# -------------------------
+class FlatForest:
+    """
+    Drop-in `predict` for a flattened RandomForestRegressor.
+    Built for one or a few rows: no input validation, no joblib dispatch
+    and no feature-name check, with outputs identical to the forest's.
+    """
+
+    def __init__(self, arrays):
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.max_depth = int(arrays["max_depth"])
+        self.n_features_in_ = int(arrays["n_features"])
+
+    @classmethod
+    def from_model(cls, model):
+        return cls(export_forest(model))
+
+    def save(self, path):
+        np.savez(
+            path, left=self.left, right=self.right, feature=self.feature,
+            threshold=self.threshold, value=self.value, roots=self.roots,
+            max_depth=self.max_depth, n_features=self.n_features_in_,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            return cls({k: arrays[k] for k in arrays.files})
+
+    def predict(self, X):
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.roots.size))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        # Same order of accumulation as RandomForestRegressor.predict:
+        # a running sum over trees, then one division
+        leaf_values = self.value[nodes]
+        return np.cumsum(leaf_values, axis=1)[:, -1] / self.roots.size
+
+
+def load_or_export(model, folder):
+    """FlatForest stored next to a model artifact, exported on first use."""
+    path = os.path.join(folder, FLAT_FILE)
+    if os.path.exists(path):
+        return FlatForest.load(path)
+    flat = FlatForest.from_model(model)
+    try:
+        flat.save(path)
+    except OSError:
+        pass  # read-only store: keep the in-memory export
+    return flat
+
+# -------------------------
+# Benchmark
+# -------------------------
+def benchmark(model, X, batch_sizes=(1, 8, 64), repeat=200):
+    """
+    Time RandomForestRegressor.predict against FlatForest.predict and
+    check both give identical outputs. Returns one dict per batch size.
+    """
+    flat = FlatForest.from_model(model)
+    X = np.asarray(X, dtype=np.float64)
+    results = []
+    for size in batch_sizes:
+        batch = X[:size]
+        with warnings.catch_warnings():
+            # Model was fit on a DataFrame; the ndarray path is what tab2 uses
+            warnings.simplefilter("ignore", UserWarning)
+            expected = model.predict(batch)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                model.predict(batch)
+            sklearn_us = (time.perf_counter() - start) / repeat * 1e6
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            got = flat.predict(batch)
+        flat_us = (time.perf_counter() - start) / repeat * 1e6
+
+        results.append({
+            "rows": len(batch),
+            "sklearn_us": round(sklearn_us, 1),
+            "flat_us": round(flat_us, 1),
+            "speedup": round(sklearn_us / flat_us, 1),
+            "identical": bool(np.array_equal(expected, got)),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    from model_store import load_or_train
+
+    model, metrics, X_train, X_test, *_ = load_or_train()
+    for row in benchmark(model, X_test.to_numpy()):
+        print(row)
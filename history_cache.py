@@ -0,0 +1,101 @@
+# history_cache.py
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+import history_store
+
+# -------------------------
+# Shared History Cache
+# -------------------------
+# Several pages read the same user's history (tab2 and tab5 both read the
+# daily pulse checks). Each (database, table, user) is parsed once and the
+# parsed frame is shared by every page and session until the database
+# files change on disk. Callers must treat returned frames as read-only.
+def file_signature(path):
+    """(size, mtime_ns, inode) of a file, or None when it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def store_signature(path=None):
+    # Commits from other processes touch the -wal file (a checkpoint, the
+    # main file); this process's own writes also bump the store's counter
+    path = path or history_store.DB_PATH
+    return file_signature(path), file_signature(path + "-wal"), history_store.generation(path)
+
+
+def _parse(df):
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], errors="coerce", format="mixed")
+        df = df.dropna(subset=["date"]).sort_values("date", ascending=False, kind="stable")
+    return df.reset_index(drop=True)
+
+
+class HistoryCache:
+    """Bounded LRU of parsed per-user histories, validated by file stat."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, table, username="", path=None):
+        """One user's full history of `table`, dates parsed, newest first."""
+        path = path or history_store.DB_PATH
+        key = (path, table, username)
+        signature = store_signature(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        frame = _parse(history_store.history(table, username=username, path=path))
+        with self._lock:
+            # Keyed on the signature seen before reading: a write that lands
+            # meanwhile changes it, so the next call re-reads
+            self._entries[key] = (signature, frame)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return frame
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_cache = HistoryCache()
+
+
+def cached_history(table, username=None, path=None):
+    """Shared parsed history of the session user (or `username`)."""
+    if username is None:
+        username = history_store.session_user()
+    return _cache.get(table, username, path)
+
+
+def stats():
+    return _cache.stats()
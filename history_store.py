@@ -0,0 +1,605 @@
+# history_store.py
+import argparse
+import atexit
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import daily_schema
+from model_store import file_digest
+
+# -------------------------
+# Location & Schema
+# -------------------------
+# One embedded SQLite database in WAL mode replaces the three append-only
+# CSVs: writers append rows in short transactions, readers never block
+# them, and "latest N" is an index range scan instead of a full re-read.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+DB_PATH = os.path.join(DATA_DIR, "mindsync.db")
+
+TABLES = {
+    "daily": {
+        "date_column": "date",
+        "csv": "user_daily_data.csv",
+        "columns": {
+            "date": "TEXT NOT NULL",
+            "screen_time_hours": "REAL",
+            "work_screen_hours": "REAL",
+            "leisure_screen_hours": "REAL",
+            "sleep_hours": "REAL",
+            "sleep_quality": "REAL",
+            "exercise_minutes": "REAL",
+            "social_hours": "REAL",
+            "stress_level": "REAL",
+            "productivity": "REAL",
+            "predicted_wellness": "REAL",
+        },
+    },
+    "activities": {
+        "date_column": "tanggal",
+        "csv": "activities.csv",
+        "columns": {
+            "tanggal": "TEXT NOT NULL",
+            "aktivitas": "TEXT",
+            "kategori": "TEXT",
+            "durasi": "INTEGER",
+            "intensitas": "INTEGER",
+            "catatan": "TEXT",
+            "created_at": "TEXT",
+        },
+    },
+    "compass": {
+        "date_column": "date",
+        "csv": "digital_compass_data.csv",
+        "columns": {
+            "date": "TEXT NOT NULL",
+            "digital_wellness_score": "REAL",
+            "wellness_level": "TEXT",
+            "total_fomo_score": "REAL",
+            "total_daily_usage_mins": "INTEGER",
+            "total_platforms_used": "INTEGER",
+            **{f"{p}_mins": "INTEGER" for p in (
+                "instagram", "tiktok", "youtube", "facebook", "twitter",
+                "whatsapp", "snapchat", "discord", "linkedin", "other",
+            )},
+            **{f"{c}_score": "REAL" for c in (
+                "anxiety", "fomo", "social_comparison", "validation_seeking",
+                "habit_formation", "mindless_consumption", "self_esteem",
+            )},
+        },
+    },
+}
+
+
+def _schema_sql():
+    statements = [
+        "CREATE TABLE IF NOT EXISTS imports (path TEXT PRIMARY KEY, digest TEXT NOT NULL, rows INTEGER NOT NULL)"
+    ]
+    for table, spec in TABLES.items():
+        cols = ", ".join(f"{name} {kind}" for name, kind in spec["columns"].items())
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            f"(id INTEGER PRIMARY KEY, username TEXT NOT NULL DEFAULT '', {cols})"
+        )
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS {table}_user_date ON {table} (username, {spec['date_column']}, id)"
+        )
+    return statements
+
+# -------------------------
+# Connections
+# -------------------------
+# sqlite3 connections must stay on the thread that opened them, and
+# Streamlit runs each session on its own thread: one connection per
+# (thread, database), opened and migrated on first use.
+_local = threading.local()
+_migrate_lock = threading.Lock()
+_migrated = set()
+_generations = {}  # path -> writes made by this process
+_generation_lock = threading.Lock()
+
+
+def generation(path=None):
+    """Writes this process has committed to a database. Together with the
+    file stats it tells readers whether a cached read is still current,
+    even when two commits land within one mtime tick."""
+    return _generations.get(path or DB_PATH, 0)
+
+
+def _written(path):
+    path = path or DB_PATH
+    with _generation_lock:
+        _generations[path] = _generations.get(path, 0) + 1
+
+
+def connect(path=None):
+    path = path or DB_PATH
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # durable at checkpoints; WAL keeps it consistent
+        conn.execute("PRAGMA busy_timeout=30000")
+        with conn:
+            for statement in _schema_sql():
+                conn.execute(statement)
+        conns[path] = conn
+        _ensure_migrated(conn, path)
+    return conn
+
+
+def close_all():
+    """Close this thread's connections (tests and benchmarks switch databases)."""
+    for conn in getattr(_local, "conns", {}).values():
+        conn.close()
+    _local.conns = {}
+
+# -------------------------
+# Partitioning by User
+# -------------------------
+# Every row belongs to the sidebar username of the session that wrote it;
+# "" holds rows written before a name was entered (and the legacy CSVs).
+# Reads filter on the leading username column of each table's index, so
+# their cost follows one user's history, not everyone's.
+def session_user():
+    """Username of the current Streamlit session, "" when none was entered."""
+    return st.session_state.get("username", "")
+
+
+def assign_user(username, from_user="", path=None):
+    """Move every row of `from_user` (by default the unowned ones) to `username`."""
+    conn = connect(path)
+    moved = 0
+    with conn:
+        for table in TABLES:
+            moved += conn.execute(
+                f"UPDATE {table} SET username = ? WHERE username = ?", (username, from_user)
+            ).rowcount
+    _written(path)
+    return moved
+
+# -------------------------
+# Writes
+# -------------------------
+def _sql_value(value):
+    if value is None:
+        return None
+    if hasattr(value, "item"):  # numpy scalars
+        value = value.item()
+    if isinstance(value, float) and value != value:  # NaN
+        return None
+    return value
+
+
+def _row_values(table, row, username):
+    return [username] + [_sql_value(row.get(col)) for col in TABLES[table]["columns"]]
+
+
+def _insert_sql(table):
+    cols = ["username"] + list(TABLES[table]["columns"])
+    return f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+
+
+def _insert_rows(conn, table, rows, username):
+    conn.executemany(_insert_sql(table), (_row_values(table, row, username) for row in rows))
+
+
+def insert(table, rows, username="", path=None):
+    """Append rows (dicts keyed by column) with one prepared statement in one transaction."""
+    conn = connect(path)
+    with conn:
+        _insert_rows(conn, table, rows, username)
+    _written(path)
+
+
+def append(table, row, username="", path=None):
+    """Append one row; returns its id."""
+    conn = connect(path)
+    with conn:
+        row_id = conn.execute(_insert_sql(table), _row_values(table, row, username)).lastrowid
+    _written(path)
+    return row_id
+
+
+def replace_all(table, rows, username="", path=None):
+    """Overwrite one user's rows of a table."""
+    conn = connect(path)
+    with conn:
+        conn.execute(f"DELETE FROM {table} WHERE username = ?", (username,))
+        _insert_rows(conn, table, rows, username)
+    _written(path)
+
+# -------------------------
+# Batched Writer
+# -------------------------
+# Save clicks from every session go through one queue drained by one
+# thread. Whatever is pending when the thread wakes is group-committed in
+# a single transaction, so a burst of saves costs one commit (and at most
+# one fsync) instead of one each, and the click returns before the disk
+# is touched. Other processes are kept out by SQLite's advisory locks on
+# the database file for the length of the commit.
+FSYNC_POLICIES = {
+    "commit": "FULL",        # fsync every group commit
+    "checkpoint": "NORMAL",  # fsync when the WAL is checkpointed
+    "off": "OFF",            # leave it to the OS
+}
+BATCH_ROWS = 1000
+
+_queue = queue.Queue()
+_writer_lock = threading.Lock()
+_writer = None
+_fsync_policy = "checkpoint"
+_writer_counts = {"batches": 0, "rows": 0, "failed": 0}
+_flush_seconds = deque(maxlen=1000)  # commit duration per batch
+_lag_seconds = deque(maxlen=1000)    # submit to commit per write
+
+
+class _Write:
+    __slots__ = ("op", "table", "rows", "username", "path", "future", "queued_at")
+
+    def __init__(self, op, table=None, rows=(), username="", path=None):
+        self.op, self.table, self.rows, self.username = op, table, list(rows), username
+        self.path = path or DB_PATH
+        self.future = Future()
+        self.queued_at = time.perf_counter()
+
+
+def set_fsync_policy(policy):
+    """Choose when group commits reach the disk (see FSYNC_POLICIES)."""
+    global _fsync_policy
+    if policy not in FSYNC_POLICIES:
+        raise ValueError(f"fsync policy must be one of {sorted(FSYNC_POLICIES)}")
+    _fsync_policy = policy
+
+
+def _ensure_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_drain, name="history-writer", daemon=True)
+            _writer.start()
+
+
+def submit(table, rows, username="", path=None, replace=False):
+    """
+    Queue rows for the writer thread and return at once. The returned
+    Future resolves to the id of the last row written once they are
+    committed; with replace=True they overwrite the user's rows like
+    replace_all().
+    Writes are applied in submission order.
+    """
+    write = _Write("replace" if replace else "insert", table, rows, username, path)
+    _ensure_writer()
+    _queue.put(write)
+    return write.future
+
+
+def flush(timeout=None):
+    """Wait until every write submitted so far is committed."""
+    if _writer is None:
+        return True
+    barrier = _Write("barrier")
+    _queue.put(barrier)
+    try:
+        barrier.future.result(timeout)
+        return True
+    except TimeoutError:
+        return False
+
+
+def _apply(conn, write):
+    if write.op == "replace":
+        conn.execute(f"DELETE FROM {write.table} WHERE username = ?", (write.username,))
+    _insert_rows(conn, write.table, write.rows, write.username)
+    return conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+
+
+def _commit(path, writes):
+    conn = connect(path)
+    conn.execute(f"PRAGMA synchronous={FSYNC_POLICIES[_fsync_policy]}")
+    start = time.perf_counter()
+    try:
+        with conn:
+            outcomes = [_apply(conn, write) for write in writes]
+    except Exception:
+        # One bad write must not sink the batch: redo them one transaction each
+        outcomes = []
+        for write in writes:
+            try:
+                with conn:
+                    outcomes.append(_apply(conn, write))
+            except Exception as e:
+                outcomes.append(e)
+    done = time.perf_counter()
+    _written(path)
+
+    _flush_seconds.append(done - start)
+    _writer_counts["batches"] += 1
+    for write, outcome in zip(writes, outcomes):
+        _lag_seconds.append(done - write.queued_at)
+        if isinstance(outcome, Exception):
+            _fail(write, outcome)
+        else:
+            _writer_counts["rows"] += len(write.rows)
+            write.future.set_result(outcome)
+
+
+def _fail(write, error):
+    # The page already told the user it saved, so a lost write is logged
+    # here and counted in writer_stats()["failed"] for the sidebar
+    _writer_counts["failed"] += 1
+    print(f"❌ History writer: {len(write.rows)} {write.table} rows for "
+          f"{write.username!r} not saved: {error!r}", file=sys.stderr)
+    write.future.set_exception(error)
+
+
+def _drain():
+    while True:
+        batch = [_queue.get()]
+        rows = len(batch[0].rows)
+        while rows < BATCH_ROWS:
+            try:
+                write = _queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(write)
+            rows += len(write.rows)
+
+        by_path = {}
+        for write in batch:
+            if write.op != "barrier":
+                by_path.setdefault(write.path, []).append(write)
+        for path, writes in by_path.items():
+            try:
+                _commit(path, writes)
+            except Exception as e:  # e.g. the database cannot be opened
+                for write in writes:
+                    if not write.future.done():
+                        _fail(write, e)
+        for write in batch:
+            if write.op == "barrier":
+                write.future.set_result(0)
+            _queue.task_done()
+
+
+def writer_stats():
+    """Queue depth, group-commit counts and flush latency of the batched writer."""
+    flush_ms = np.array(_flush_seconds) * 1000
+    lag_ms = np.array(_lag_seconds) * 1000
+    batches = _writer_counts["batches"]
+    return {
+        "queued": _queue.qsize(),
+        "batches": batches,
+        "rows": _writer_counts["rows"],
+        "failed": _writer_counts["failed"],
+        "rows_per_batch": round(_writer_counts["rows"] / batches, 1) if batches else 0.0,
+        "flush_ms_p50": float(np.percentile(flush_ms, 50)) if len(flush_ms) else 0.0,
+        "flush_ms_p95": float(np.percentile(flush_ms, 95)) if len(flush_ms) else 0.0,
+        "lag_ms_p95": float(np.percentile(lag_ms, 95)) if len(lag_ms) else 0.0,
+        "fsync": _fsync_policy,
+    }
+
+
+# Queued saves are committed before the interpreter exits
+atexit.register(flush, 10)
+
+# -------------------------
+# Reads
+# -------------------------
+def _frame(cursor):
+    names = [d[0] for d in cursor.description]
+    return pd.DataFrame.from_records(cursor.fetchall(), columns=names)
+
+
+def history(table, username="", start=None, end=None, limit=None, newest_first=True, require=(), path=None):
+    """
+    Rows of one user with `start` <= date < `end` (date strings; either
+    may be omitted), newest first by default. `limit` returns only the latest N; `require`
+    skips rows with NULL in any of those columns. Served from the
+    (username, date) index.
+    """
+    date_col = TABLES[table]["date_column"]
+    cols = list(TABLES[table]["columns"])
+    where, params = ["username = ?"], [username]
+    if start is not None:
+        where.append(f"{date_col} >= ?")
+        params.append(str(start))
+    if end is not None:
+        where.append(f"{date_col} < ?")
+        params.append(str(end))
+    where += [f"{col} IS NOT NULL" for col in require]
+    order = "DESC" if newest_first else "ASC"
+    sql = (f"SELECT {', '.join(cols)} FROM {table} WHERE {' AND '.join(where)} "
+           f"ORDER BY {date_col} {order}, id {order}")
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+    df = _frame(connect(path).execute(sql, params))
+    return df if not df.empty else pd.DataFrame(columns=cols)
+
+
+def latest(table, n, username="", require=(), path=None):
+    """The user's latest n rows, newest first."""
+    return history(table, username, limit=n, require=require, path=path)
+
+
+def count(table, username="", path=None):
+    return connect(path).execute(f"SELECT COUNT(*) FROM {table} WHERE username = ?", (username,)).fetchone()[0]
+
+def last_id(table, path=None):
+    """Highest row id of a table: an O(1) change token for append-only writes."""
+    return connect(path).execute(f"SELECT MAX(id) FROM {table}").fetchone()[0] or 0
+
+# -------------------------
+# Incremental Recent History
+# -------------------------
+class RecentHistory:
+    """
+    The newest `limit` rows of one user's table, kept in memory.
+
+    append() queues the row for the batched writer and prepends it to the
+    in-memory frame, so a save costs the same however long the history is
+    and does not wait for the commit. frame() only re-queries when the
+    table's last id shows a write this object did not make itself.
+    `source(table, username, path)`, when given, supplies the user's whole
+    history newest first (e.g. history_cache.cached_history) so reloads
+    share its parsed frame instead of querying on their own.
+    """
+
+    def __init__(self, table, username="", limit=5, require=(), prepare=None, path=None, source=None):
+        self.table = table
+        self.username = username
+        self.limit = limit
+        self.require = tuple(require)
+        self.prepare = prepare or (lambda df: df)
+        self.path = path
+        self.source = source
+        self._frame = None
+        self._token = None
+
+    def _reload(self):
+        self._token = last_id(self.table, self.path)
+        if self.source is None:
+            rows = latest(self.table, self.limit, self.username, require=self.require, path=self.path)
+        else:
+            rows = self.source(self.table, self.username, self.path)
+            rows = rows.dropna(subset=[c for c in self.require if c in rows.columns])
+            rows = rows.head(self.limit).reset_index(drop=True)
+        self._frame = self.prepare(rows)
+
+    def frame(self):
+        if self._frame is None or last_id(self.table, self.path) != self._token:
+            self._reload()
+        return self._frame
+
+    def append(self, row):
+        """Queue one row (returns the writer's Future) and show it right away."""
+        if self._frame is None or last_id(self.table, self.path) != self._token:
+            self._reload()
+        future = submit(self.table, [row], self.username, self.path)
+        token = self._token
+
+        def landed(f):
+            # Our own row needs no reload, unless another write came first
+            if f.exception() is None and self._token == token and f.result() == (token or 0) + 1:
+                self._token = f.result()
+        future.add_done_callback(landed)
+        if all(_sql_value(row.get(col)) is not None for col in self.require):
+            new = self.prepare(pd.DataFrame([{col: row.get(col) for col in TABLES[self.table]["columns"]}]))
+            frame = new if self._frame.empty else pd.concat([new, self._frame], ignore_index=True)
+            self._frame = frame.head(self.limit)
+        return future
+
+# -------------------------
+# CSV Migration
+# -------------------------
+def _csv_rows(table, csv_path):
+    """CSV rows as dicts of the table's columns (and username, if present), with NaN as NULL."""
+    if table == "daily":
+        # Typed and schema-checked; rows that cannot be read go to a side file
+        df, quarantine, _ = daily_schema.validate_csv(csv_path)
+        daily_schema.write_quarantine(quarantine, csv_path)
+    else:
+        df = pd.read_csv(csv_path)
+    cols = [c for c in ["username", *TABLES[table]["columns"]] if c in df.columns]
+    df = df[cols].astype(object).where(df[cols].notna(), None)
+    return df.to_dict("records")
+
+
+def import_csv(table, csv_path, username="", path=None):
+    """
+    Import one CSV into a table. Re-running is a no-op for an unchanged
+    file; a file that grew (the legacy files were append-only) only
+    contributes the rows added since its last import. A username column
+    in the file partitions its rows; otherwise they go to `username`.
+    """
+    conn = connect(path)
+    digest = file_digest(csv_path)
+    key = os.path.abspath(csv_path)
+    seen = conn.execute("SELECT digest, rows FROM imports WHERE path = ?", (key,)).fetchone()
+    if seen and seen[0] == digest:
+        return 0
+    rows = _csv_rows(table, csv_path)
+    new_rows = rows[seen[1]:] if seen else rows
+    with conn:
+        conn.executemany(
+            _insert_sql(table),
+            (_row_values(table, row, row.get("username") or username) for row in new_rows),
+        )
+        conn.execute("INSERT OR REPLACE INTO imports VALUES (?, ?, ?)", (key, digest, len(rows)))
+    _written(path)
+    return len(new_rows)
+
+
+def _ensure_migrated(conn, path):
+    # The first connection to a database imports the legacy CSVs found in
+    # DATA_DIR; tables that already hold rows are left alone
+    with _migrate_lock:
+        if path in _migrated:
+            return
+        _migrated.add(path)
+        for table, spec in TABLES.items():
+            csv_path = os.path.join(DATA_DIR, spec["csv"])
+            has_rows = conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone()
+            if os.path.exists(csv_path) and not has_rows:
+                import_csv(table, csv_path, path=path)
+        repair_daily(path)
+
+
+def repair_daily(path=None):
+    """Remap daily rows imported shifted from the legacy CSV; returns how many."""
+    conn = connect(path)
+    cols = daily_schema.COLUMNS
+    df = _frame(conn.execute(
+        f"SELECT id, {', '.join(cols)} FROM daily WHERE productivity IS NULL AND predicted_wellness IS NULL"
+    ))
+    shifted = daily_schema.shifted_rows(df)
+    df, repaired = daily_schema.repair_frame(df)
+    if repaired:
+        fixed = df[shifted]
+        with conn:
+            conn.executemany(
+                f"UPDATE daily SET {', '.join(f'{c} = ?' for c in cols[1:])} WHERE id = ?",
+                ([_sql_value(v) for v in row[cols[1:]]] + [int(row["id"])] for _, row in fixed.iterrows()),
+            )
+        _written(path)
+    return repaired
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import the legacy CSV files into the SQLite history store.")
+    parser.add_argument("--data-dir", help="folder with the legacy CSVs (default: data/)")
+    parser.add_argument("--db", help="database file (default: data/mindsync.db)")
+    parser.add_argument("--owner", help="give the unowned (legacy) rows to this username")
+    args = parser.parse_args(argv)
+
+    global DATA_DIR
+    DATA_DIR = args.data_dir or DATA_DIR  # the first connection migrates from the same folder
+    args.data_dir = DATA_DIR
+    for table, spec in TABLES.items():
+        csv_path = os.path.join(args.data_dir, spec["csv"])
+        if not os.path.exists(csv_path):
+            print(f"{table:12s} no {spec['csv']}")
+            continue
+        added = import_csv(table, csv_path, path=args.db)
+        print(f"{table:12s} {added:>8,} rows imported")
+    if args.owner:
+        print(f"{assign_user(args.owner, path=args.db):,} unowned rows assigned to {args.owner!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# model_service.py
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from forest_predictor import load_or_export
+from model_store import artifact_dir, artifact_key, artifact_meta, load_or_train, release_artifacts
+from prediction_lattice import build_lattice, lattice_path, save_lattice
+
+# -------------------------
+# Serving Slot
+# -------------------------
+# The model that tab2_pulse_check and tab4_life_balance score with lives in
+# one immutable dict. A finished background fit replaces the whole dict in a
+# single assignment, so readers see either the old model or the new one,
+# never a mix of the two.
+DATA_PATH = "data/kaggle.csv"
+
+_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-train")
+_current = None  # {"model", "predictor", "metrics", "version", "data_version", "fit_seconds", "swapped_at"}
+_pending = None  # (artifact key, Future) of the fit in flight
+_last_error = None  # (artifact key, message) of the last failed fit
+
+
+def _build(path, key, data_version, df=None):
+    """Fit (or load from the model store) and wrap the result for serving."""
+    model, metrics, *_ = load_or_train(path, df=df)
+    meta = artifact_meta(key)
+    return {
+        "model": model,
+        "predictor": load_or_export(model, artifact_dir(key)),
+        "metrics": metrics,
+        "version": key,
+        "data_version": data_version,
+        "fit_seconds": meta.get("fit_seconds"),
+        "swapped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def _build_lattice(key, model):
+    try:
+        save_lattice(build_lattice(model), key)
+    except Exception as e:
+        # The What-If panel stays hidden; `python prediction_lattice.py` can retry
+        print(f"❌ Lattice for model {key}: {type(e).__name__}: {e}", file=sys.stderr)
+
+
+def _serve(bundle):
+    """Queue the What-If lattice of a newly served model if it has none yet."""
+    if not os.path.exists(lattice_path(bundle["version"])):
+        _executor.submit(_build_lattice, bundle["version"], bundle["model"])
+
+
+def _train_in_background(path, key, data_version):
+    global _current, _last_error
+    try:
+        bundle = _build(path, key, data_version)
+    except Exception as e:
+        # Keep serving the previous model; a failed version is not retried
+        with _lock:
+            _last_error = (key, f"{type(e).__name__}: {e}")
+            _clear_pending(key)
+        return None
+    with _lock:
+        _current = bundle
+        _last_error = None
+        _clear_pending(key)
+    # The previous version is no longer served; let its memory go
+    release_artifacts(key)
+    _serve(bundle)
+    return bundle
+
+
+def _clear_pending(key):
+    global _pending
+    if _pending is not None and _pending[0] == key:
+        _pending = None
+
+# -------------------------
+# Public API
+# -------------------------
+def get_bundle(data_version, path=DATA_PATH, df=None):
+    """
+    Model currently being served for `path`.
+
+    The very first call in a process builds the model synchronously (a
+    model-store hit when the artifact already exists). After that, a new
+    artifact key (new data version or newly tuned hyperparameters) starts
+    a fit on the background worker and the previous model keeps serving
+    until the fit finishes and is swapped in.
+    """
+    global _current, _pending
+    key = artifact_key(path)
+    current = _current
+    if current is None:
+        with _lock:
+            if _current is None:
+                _current = _build(path, key, data_version, df=df)
+                _serve(_current)
+            return _current
+
+    if current["version"] != key:
+        with _lock:
+            stale = _pending is None or _pending[0] != key
+            failed = _last_error is not None and _last_error[0] == key
+            if _current["version"] != key and stale and not failed:
+                future = _executor.submit(_train_in_background, path, key, data_version)
+                _pending = (key, future)
+    return _current
+
+
+def status():
+    """Version, fit duration and swap time of the served model, plus training state."""
+    current = _current
+    pending = _pending
+    return {
+        "version": current["version"] if current else None,
+        "fit_seconds": current["fit_seconds"] if current else None,
+        "swapped_at": current["swapped_at"] if current else None,
+        "training": pending is not None and not pending[1].done(),
+        "last_error": _last_error[1] if _last_error else None,
+    }
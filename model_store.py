@@ -0,0 +1,250 @@
+# model_store.py
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+
+import joblib
+import numpy as np
+import sklearn
+
+from utils import load_data, prepare_data, train_model, calculate_metrics
+
+# -------------------------
+# Store Location
+# -------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(BASE_DIR, "models")
+
+DEFAULT_TRAIN_PARAMS = {
+    "test_size": 0.2,
+    "random_state": 42,
+    "n_estimators": 300,
+}
+
+# Winning configuration of the last `python tuning.py` run
+TUNED_PARAMS_FILE = os.path.join(STORE_DIR, "tuned_params.json")
+
+_lock = threading.Lock()
+_digest_memo = {}    # path -> (stat signature, sha256 of file content)
+_artifact_memo = {}  # artifact key -> loaded pipeline tuple
+_tuned_memo = None   # (stat signature, tuned params) of TUNED_PARAMS_FILE
+
+# -------------------------
+# Content Addressing
+# -------------------------
+def _stat_signature(path):
+    """Cheap identity of a file: size, mtime and inode."""
+    st = os.stat(path)
+    return (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+def file_digest(path, block_size=1 << 20):
+    """
+    SHA-256 of the file content.
+    The digest is memoised on (size, mtime, inode) so an unchanged file
+    costs a single os.stat instead of a full re-hash.
+    """
+    path = os.path.abspath(path)
+    signature = _stat_signature(path)
+    cached = _digest_memo.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    _digest_memo[path] = (signature, digest)
+    return digest
+
+
+def tuned_params():
+    """Forest hyperparameters chosen by tuning.py, or {} if it was never run."""
+    global _tuned_memo
+    try:
+        signature = _stat_signature(TUNED_PARAMS_FILE)
+    except FileNotFoundError:
+        return {}
+    if _tuned_memo is None or _tuned_memo[0] != signature:
+        with open(TUNED_PARAMS_FILE, encoding="utf-8") as f:
+            _tuned_memo = (signature, json.load(f)["params"])
+    return dict(_tuned_memo[1])
+
+
+def save_tuned_params(params, **info):
+    """Publish a tuned configuration; later fits and artifact keys use it."""
+    os.makedirs(STORE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tuned-", suffix=".json", dir=STORE_DIR)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"params": params, **info}, f, indent=2)
+    os.replace(tmp_path, TUNED_PARAMS_FILE)
+
+
+def resolve_train_params(**params):
+    """Defaults, overridden by tuned params, overridden by explicit params."""
+    return {**DEFAULT_TRAIN_PARAMS, **tuned_params(), **params}
+
+
+def artifact_key(path, target="mental_wellness_index_0_100", **params):
+    """
+    Key of a fitted pipeline: training data content + target + train_model
+    hyperparameters + scikit-learn version (pickles are version-bound).
+    """
+    train_params = resolve_train_params(**params)
+    payload = json.dumps({
+        "data": file_digest(path),
+        "target": target,
+        "params": train_params,
+        "sklearn": sklearn.__version__,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def artifact_dir(key):
+    return os.path.join(STORE_DIR, key)
+
+# -------------------------
+# Save & Load Artifacts
+# -------------------------
+def save_artifact(key, model, train_pos, test_pos, y_pred, metrics, meta):
+    """
+    Write one artifact directory atomically (temp dir + rename), so readers
+    never see a half-written model.
+    """
+    os.makedirs(STORE_DIR, exist_ok=True)
+    final_dir = artifact_dir(key)
+    tmp_dir = tempfile.mkdtemp(prefix=f".{key}-", dir=STORE_DIR)
+    try:
+        # Uncompressed so numpy buffers can be memory-mapped back
+        joblib.dump(model, os.path.join(tmp_dir, "model.joblib"))
+        np.save(os.path.join(tmp_dir, "train_index.npy"), np.asarray(train_pos, dtype=np.int64))
+        np.save(os.path.join(tmp_dir, "test_index.npy"), np.asarray(test_pos, dtype=np.int64))
+        np.save(os.path.join(tmp_dir, "y_pred.npy"), np.asarray(y_pred, dtype=np.float64))
+        with open(os.path.join(tmp_dir, "metrics.pkl"), "wb") as f:
+            pickle.dump(metrics, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        try:
+            os.replace(tmp_dir, final_dir)
+        except OSError:
+            if has_artifact(key) or not os.path.isdir(final_dir):
+                raise
+            # A directory without meta.json was never published; move it
+            # aside and publish over it
+            stale = tempfile.mkdtemp(prefix=f".{key}-stale-", dir=STORE_DIR)
+            os.replace(final_dir, stale)
+            shutil.rmtree(stale, ignore_errors=True)
+            os.replace(tmp_dir, final_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not has_artifact(key):
+            raise
+        # Another process published the same key first; keep theirs
+    return final_dir
+
+
+def load_artifact(key):
+    """Load a stored artifact; numpy payloads are memory-mapped read-only."""
+    folder = artifact_dir(key)
+    model = joblib.load(os.path.join(folder, "model.joblib"), mmap_mode="r")
+    train_pos = np.load(os.path.join(folder, "train_index.npy"), mmap_mode="r")
+    test_pos = np.load(os.path.join(folder, "test_index.npy"), mmap_mode="r")
+    y_pred = np.load(os.path.join(folder, "y_pred.npy"), mmap_mode="r")
+    with open(os.path.join(folder, "metrics.pkl"), "rb") as f:
+        metrics = pickle.load(f)
+    with open(os.path.join(folder, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    return model, train_pos, test_pos, y_pred, metrics, meta
+
+
+def artifact_meta(key):
+    """meta.json of a stored artifact, or {} when it does not exist."""
+    try:
+        with open(os.path.join(artifact_dir(key), "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def has_artifact(key):
+    return os.path.exists(os.path.join(artifact_dir(key), "meta.json"))
+
+# -------------------------
+# Cached Training Pipeline
+# -------------------------
+def _fit_and_store(key, X, y, features, target, train_params):
+    start = time.perf_counter()
+    # Trees are fit on every core; n_jobs does not change the fitted trees
+    model, X_train, X_test, y_train, y_test, y_pred = train_model(X, y, n_jobs=-1, **train_params)
+    fit_seconds = time.perf_counter() - start
+    # Stored model predicts serially, so tree sums add up in a fixed order
+    model.set_params(n_jobs=None)
+    metrics = calculate_metrics(y_test, y_pred, X_columns=features, model=model)
+
+    train_pos = X.index.get_indexer(X_train.index)
+    test_pos = X.index.get_indexer(X_test.index)
+    meta = {
+        "key": key,
+        "target": target,
+        "features": list(features),
+        "params": train_params,
+        "sklearn": sklearn.__version__,
+        "fit_seconds": round(fit_seconds, 4),
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    save_artifact(key, model, train_pos, test_pos, y_pred, metrics, meta)
+    return model, X_train, X_test, y_train, y_test, y_pred, metrics
+
+
+def load_or_train(path="data/kaggle.csv", target="mental_wellness_index_0_100", df=None, **params):
+    """
+    Same outputs as utils.train_pipeline, but the fit happens at most once
+    per (data content, hyperparameters). Later calls load the stored
+    artifact; repeated calls in the same process only stat the CSV.
+
+    Returns model, metrics, X_train, X_test, y_train, y_test, y_pred.
+    """
+    train_params = resolve_train_params(**params)
+    key = artifact_key(path, target=target, **train_params)
+    cached = _artifact_memo.get(key)
+    if cached is not None:
+        return cached
+
+    with _lock:
+        cached = _artifact_memo.get(key)
+        if cached is not None:
+            return cached
+
+        if df is None:
+            df = load_data(path)
+        X, y, features = prepare_data(df, target=target)
+
+        if has_artifact(key):
+            model, train_pos, test_pos, y_pred, metrics, _ = load_artifact(key)
+            X_train, X_test = X.iloc[train_pos], X.iloc[test_pos]
+            y_train, y_test = y.iloc[train_pos], y.iloc[test_pos]
+        else:
+            model, X_train, X_test, y_train, y_test, y_pred, metrics = _fit_and_store(
+                key, X, y, features, target, train_params
+            )
+
+        result = (model, metrics, X_train, X_test, y_train, y_test, y_pred)
+        _artifact_memo[key] = result
+        return result
+
+
+def release_artifacts(keep):
+    """
+    Forget every memoised pipeline except `keep`, so a replaced model
+    version (forest and train/test copies) can be garbage collected.
+    """
+    # No _lock: it is held for a whole fit, and single dict ops are atomic
+    for key in list(_artifact_memo):
+        if key != keep:
+            _artifact_memo.pop(key, None)
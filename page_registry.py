@@ -0,0 +1,90 @@
+# page_registry.py
+import importlib
+import os
+import subprocess
+import sys
+import time
+
+# -------------------------
+# Lazy Page Modules
+# -------------------------
+# Each page module (and with it plotly and the rest of its plotting stack)
+# is imported the first time its page is selected, not at app start-up.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PAGES = {
+    "Home Base": "tabs.tab1_home_base",
+    "Pulse Check": "tabs.tab2_pulse_check",
+    "Wellness Map": "tabs.tab3_welness_map",
+    "Life Balance": "tabs.tab4_life_balance",
+    "Digital Compass": "tabs.tab5_digital_compass",
+    "Growth Journey": "tabs.tab6_growth_journey",
+}
+
+_import_seconds = {}  # page label -> seconds its first import took
+
+
+def load_page(label):
+    """Import (once per process) and return the module behind a page label."""
+    name = PAGES[label]
+    module = sys.modules.get(name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        _import_seconds[label] = time.perf_counter() - start
+    return module
+
+
+def page_import_times():
+    """Seconds spent importing each page loaded so far in this process."""
+    return dict(_import_seconds)
+
+# -------------------------
+# Import-Time Report
+# -------------------------
+def _importtime(modules):
+    """
+    Run `python -X importtime -c "import ..."` in a fresh interpreter and
+    return [(level, self_us, cumulative_us, name)] in import order.
+    """
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2][1:]
+        level = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((level, self_us, cumulative_us, name.strip()))
+    return rows
+
+
+def importtime_report(top=5):
+    """
+    Cold-start import cost of loading every page up front versus loading
+    only one page, measured with -X importtime in fresh interpreters.
+    """
+    scenarios = {"eager (all pages)": list(PAGES.values())}
+    for label, name in PAGES.items():
+        scenarios[f"lazy: {label}"] = [name]
+
+    lines = []
+    baseline = None
+    for scenario, modules in scenarios.items():
+        rows = _importtime(modules)
+        total_ms = sum(c for level, _, c, _ in rows if level == 0) / 1000
+        if baseline is None:
+            baseline = total_ms
+        heaviest = sorted((r for r in rows if r[0] == 0), key=lambda r: r[2], reverse=True)[:top]
+        lines.append(f"{scenario:<28} {total_ms:>9.1f} ms   saved {baseline - total_ms:>8.1f} ms")
+        for _, _, cumulative_us, name in heaviest:
+            lines.append(f"    {cumulative_us / 1000:>9.1f} ms | {name}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(importtime_report())
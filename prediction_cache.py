@@ -0,0 +1,117 @@
+# prediction_cache.py
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# -------------------------
+# Input Quantization
+# -------------------------
+# Step of each Pulse Check widget, in utils.prepare_data feature order.
+# Slider and number-input values land on these grids, so the set of
+# distinct inputs people submit is small and repeats a lot.
+FEATURE_STEPS = (
+    0.5,  # screen_time_hours
+    0.5,  # work_screen_hours
+    0.5,  # leisure_screen_hours
+    0.5,  # sleep_hours
+    1.0,  # sleep_quality_1_5
+    1.0,  # stress_level_0_10
+    1.0,  # productivity_0_100
+)
+
+
+def quantize(row, steps=FEATURE_STEPS):
+    """
+    Grid key of one input row, or None when the row is off the grid
+    (e.g. a typed-in 7.3 hours), in which case it must not share a score.
+    """
+    row = np.asarray(row, dtype=np.float64).ravel()
+    codes = np.rint(row / steps)
+    if not np.array_equal(codes * steps, row):
+        return None
+    return tuple(int(c) for c in codes)
+
+# -------------------------
+# LRU Prediction Cache
+# -------------------------
+class PredictionCache:
+    """
+    Bounded LRU of scores keyed on the quantized feature vector.
+    Exposes `predict` so it can stand in for the model; the cache is
+    cleared whenever it is bound to a different model version.
+    """
+
+    def __init__(self, maxsize=4096, steps=FEATURE_STEPS):
+        self.maxsize = maxsize
+        self.steps = np.asarray(steps, dtype=np.float64)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._predictor = None
+        self.version = None
+        self.hits = self.misses = self.evictions = self.bypasses = 0
+
+    def bind(self, predictor, version):
+        """Point the cache at a model; a new version invalidates every entry."""
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+            self._predictor = predictor
+        return self
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        out = np.empty(X.shape[0], dtype=np.float64)
+        todo, todo_keys = [], []
+
+        with self._lock:
+            predictor, version = self._predictor, self.version
+            for i, row in enumerate(X):
+                key = quantize(row, self.steps)
+                if key is None:
+                    self.bypasses += 1
+                elif key in self._entries:
+                    self._entries.move_to_end(key)
+                    out[i] = self._entries[key]
+                    self.hits += 1
+                    continue
+                else:
+                    self.misses += 1
+                todo.append(i)
+                todo_keys.append(key)
+
+        if todo:
+            # One model call for every row that missed
+            scores = predictor.predict(X[todo])
+            out[todo] = scores
+            with self._lock:
+                # A bind() during the model call means these scores are from
+                # the old version: return them, but do not cache them
+                if self.version != version:
+                    return out
+                for key, score in zip(todo_keys, scores):
+                    if key is None:
+                        continue
+                    self._entries[key] = float(score)
+                    self._entries.move_to_end(key)
+                    if len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+        return out
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "version": self.version,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bypasses": self.bypasses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,145 @@
+# prediction_lattice.py
+import itertools
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_store import artifact_dir
+
+# -------------------------
+# Lattice Grid
+# -------------------------
+# (start, stop, step) per feature, in utils.prepare_data order. Steps are
+# multiples of the Pulse Check widget steps (0.5 h for hours, 1 for the
+# sliders): the full widget grid has ~7e9 points, this one ~1.4e6, and
+# lookups between grid points are interpolated multilinearly.
+DEFAULT_GRID = {
+    "screen_time_hours": (0.0, 20.0, 2.0),
+    "work_screen_hours": (0.0, 12.0, 2.0),
+    "leisure_screen_hours": (0.0, 12.0, 2.0),
+    "sleep_hours": (3.0, 12.0, 1.0),
+    "sleep_quality_1_5": (1.0, 10.0, 3.0),
+    "stress_level_0_10": (0.0, 10.0, 2.0),
+    "productivity_0_100": (0.0, 100.0, 10.0),
+}
+
+LATTICE_FILE = "lattice.npz"
+
+
+def grid_axes(grid=DEFAULT_GRID):
+    """One sorted coordinate array per feature, stop inclusive."""
+    axes = []
+    for start, stop, step in grid.values():
+        n = int(round((stop - start) / step)) + 1
+        axes.append(start + step * np.arange(n, dtype=np.float64))
+    return axes
+
+# -------------------------
+# Lattice
+# -------------------------
+class Lattice:
+    """Model scores on a regular N-d grid, queried by interpolation."""
+
+    def __init__(self, features, axes, values):
+        self.features = list(features)
+        self.axes = [np.asarray(a, dtype=np.float64) for a in axes]
+        self.values = np.asarray(values)
+        self._corners = np.array(list(itertools.product((0, 1), repeat=len(self.axes))))
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def lookup(self, X):
+        """
+        Multilinear interpolation of the stored scores at each row of X.
+        Inputs outside the grid are clamped to its edge.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        lower = np.empty(X.shape, dtype=np.int64)
+        frac = np.empty(X.shape, dtype=np.float64)
+        for d, axis in enumerate(self.axes):
+            x = np.clip(X[:, d], axis[0], axis[-1])
+            i = np.clip(np.searchsorted(axis, x, side="right") - 1, 0, len(axis) - 2)
+            lower[:, d] = i
+            frac[:, d] = (x - axis[i]) / (axis[i + 1] - axis[i])
+
+        # (rows, 2^d, d): every corner of the enclosing cell
+        idx = lower[:, None, :] + self._corners[None, :, :]
+        weights = np.where(self._corners[None, :, :] == 1, frac[:, None, :], 1.0 - frac[:, None, :]).prod(axis=2)
+        corner_values = self.values[tuple(idx[..., d] for d in range(idx.shape[2]))]
+        return (weights * corner_values).sum(axis=1)
+
+    def save(self, path):
+        arrays = {f"axis_{d}": axis for d, axis in enumerate(self.axes)}
+        np.savez_compressed(path, values=self.values, features=np.array(self.features), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            features = [str(x) for x in f["features"]]
+            axes = [f[f"axis_{d}"] for d in range(len(features))]
+            return cls(features, axes, f["values"])
+
+# -------------------------
+# Offline Build
+# -------------------------
+def build_lattice(model, grid=DEFAULT_GRID, chunk_rows=1 << 16):
+    """
+    Score `model` at every grid point, one vectorized predict per chunk
+    of grid points, and return the result as a float32 Lattice.
+    """
+    features = list(grid)
+    axes = grid_axes(grid)
+    shape = tuple(len(a) for a in axes)
+    total = int(np.prod(shape))
+    values = np.empty(total, dtype=np.float32)
+
+    for start in range(0, total, chunk_rows):
+        flat = np.arange(start, min(start + chunk_rows, total))
+        coords = np.unravel_index(flat, shape)
+        points = pd.DataFrame({f: axes[d][coords[d]] for d, f in enumerate(features)})
+        values[start:start + len(flat)] = model.predict(points)
+    return Lattice(features, axes, values.reshape(shape))
+
+
+def lattice_path(key):
+    return os.path.join(artifact_dir(key), LATTICE_FILE)
+
+
+def save_lattice(lattice, key):
+    """Store a lattice next to its model artifact (temp file + rename)."""
+    path = lattice_path(key)
+    fd, tmp_path = tempfile.mkstemp(prefix=".lattice-", suffix=".npz", dir=os.path.dirname(path))
+    with os.fdopen(fd, "wb") as f:
+        lattice.save(f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_lattice(key):
+    """Stored lattice of a model artifact, or None if it was not built."""
+    path = lattice_path(key)
+    if not os.path.exists(path):
+        return None
+    return Lattice.load(path)
+
+
+if __name__ == "__main__":
+    from model_store import artifact_key, load_or_train
+
+    model = load_or_train()[0]
+    key = artifact_key("data/kaggle.csv")
+    start = time.perf_counter()
+    lattice = build_lattice(model)
+    save_lattice(lattice, key)
+    print(
+        f"lattice {lattice.values.shape} for model {key}: "
+        f"{lattice.values.size:,} points in {time.perf_counter() - start:.1f}s, "
+        f"{os.path.getsize(lattice_path(key)) / 1024:.0f} KB on disk"
+    )
@@ -0,0 +1,288 @@
+# quantile_sketch.py
+import argparse
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from model_store import STORE_DIR, file_digest
+from streaming_stats import MEAN_COLUMNS
+
+# -------------------------
+# KLL Quantile Sketch
+# -------------------------
+# Karnin, Lang & Liberty's sketch: a stack of compactors where level h
+# holds items of weight 2^h. A full level is sorted and every other item
+# (random offset) moves up a level, so memory stays O(k log(n/k)) while
+# rank queries stay within a fixed fraction of n. Sketches built on
+# separate chunks or partitions merge into one over their union.
+DEFAULT_K = 200
+CAPACITY_DECAY = 2 / 3
+
+SKETCH_DIR = os.path.join(STORE_DIR, "sketches")
+
+
+class KLLSketch:
+    def __init__(self, k=DEFAULT_K, seed=0):
+        self.k = k
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def rank_error(self):
+        """
+        Normalized rank error at 99% confidence: a rank query is off by at
+        most this fraction of n. Empirical bound of the reference KLL
+        implementation; zero while nothing has been compacted.
+        """
+        if len(self.levels) == 1:
+            return 0.0
+        return 2.296 / self.k ** 0.9723
+
+    @property
+    def nbytes(self):
+        return sum(level.nbytes for level in self.levels)
+
+    def _capacity(self, h):
+        depth = len(self.levels) - h - 1
+        return max(2, int(np.ceil(self.k * CAPACITY_DECAY ** depth)))
+
+    def _compact(self, h):
+        if h + 1 == len(self.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        items = np.sort(self.levels[h])
+        leftover = items[:0]
+        if items.size % 2:
+            leftover, items = items[-1:], items[:-1]
+        promoted = items[self._rng.integers(2)::2]
+        self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+        self.levels[h] = leftover
+
+    def _compress(self):
+        while True:
+            full = [h for h, level in enumerate(self.levels) if level.size > self._capacity(h)]
+            if not full:
+                return
+            self._compact(full[0])
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.n += values.size
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _weighted(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(level.size, 2 ** h, dtype=np.int64) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def count_below(self, x):
+        """Estimated number of values strictly below x."""
+        items, cum = self._weighted()
+        i = np.searchsorted(items, np.asarray(x, dtype=np.float64), side="left")
+        return np.where(i > 0, cum[np.maximum(i - 1, 0)], 0) if items.size else np.zeros(np.shape(x), dtype=np.int64)
+
+    def rank(self, x):
+        """Estimated fraction of values strictly below x."""
+        return self.count_below(x) / self.n if self.n else 0.0
+
+    def quantile(self, q):
+        """Estimated value at quantile(s) q in [0, 1]."""
+        q = np.asarray(q, dtype=np.float64)
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+        items, cum = self._weighted()
+        i = np.searchsorted(cum, q * self.n, side="left")
+        out = items[np.clip(i, 0, items.size - 1)]
+        out = np.where(q <= 0, self.min, np.where(q >= 1, self.max, out))
+        return out if out.ndim else float(out)
+
+    def to_arrays(self, prefix):
+        return {
+            f"{prefix}items": np.concatenate(self.levels),
+            f"{prefix}sizes": np.array([level.size for level in self.levels], dtype=np.int64),
+            f"{prefix}header": np.array([self.n, self.k, self.min, self.max], dtype=np.float64),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix):
+        n, k, lo, hi = arrays[f"{prefix}header"]
+        sketch = cls(k=int(k))
+        sketch.n, sketch.min, sketch.max = int(n), float(lo), float(hi)
+        bounds = np.cumsum(arrays[f"{prefix}sizes"])[:-1]
+        sketch.levels = [np.array(level) for level in np.split(arrays[f"{prefix}items"], bounds)]
+        return sketch
+
+# -------------------------
+# Community Sketches
+# -------------------------
+class SketchIndex:
+    """
+    One sketch per community column, queried like community_rank.SortedIndex
+    but in memory independent of the number of rows.
+    """
+
+    def __init__(self, sketches, rows):
+        self.sketches = dict(sketches)
+        self.rows = int(rows)
+
+    @property
+    def columns(self):
+        return list(self.sketches)
+
+    @property
+    def nbytes(self):
+        return sum(s.nbytes for s in self.sketches.values())
+
+    @property
+    def rank_error(self):
+        return max((s.rank_error for s in self.sketches.values()), default=0.0)
+
+    def merge(self, other):
+        for col, sketch in other.sketches.items():
+            self.sketches.setdefault(col, KLLSketch(k=sketch.k)).merge(sketch)
+        self.rows += other.rows
+        return self
+
+    def percentile(self, col, x):
+        """Percent of community members with `col` strictly below x (± rank_error)."""
+        if not self.rows:
+            return 0.0
+        return float(self.sketches[col].count_below(x) / self.rows * 100)
+
+    def percentiles(self, values):
+        return {col: self.percentile(col, x) for col, x in values.items() if col in self.sketches}
+
+    def quantile(self, col, q):
+        return self.sketches[col].quantile(q)
+
+    def save(self, path):
+        arrays = {"columns": np.array(self.columns), "rows": np.array(self.rows)}
+        for i, sketch in enumerate(self.sketches.values()):
+            arrays.update(sketch.to_arrays(f"c{i}_"))
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            columns = [str(c) for c in f["columns"]]
+            sketches = {col: KLLSketch.from_arrays(f, f"c{i}_") for i, col in enumerate(columns)}
+            return cls(sketches, int(f["rows"]))
+
+
+def sketch_frame(df, columns=MEAN_COLUMNS, k=DEFAULT_K, seed=0):
+    """SketchIndex of one DataFrame, chunk or partition."""
+    sketches = {}
+    for col in columns:
+        if col in df.columns:
+            values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            sketches[col] = KLLSketch(k=k, seed=seed).update(values)
+    return SketchIndex(sketches, len(df))
+
+
+def sketch_csv(path="data/kaggle.csv", columns=MEAN_COLUMNS, k=DEFAULT_K, chunksize=250_000, n_jobs=None, seed=0):
+    """
+    Sketch a community CSV of any size: chunks are sketched in parallel
+    threads (the sorts release the GIL) and merged as they finish.
+    """
+    index = SketchIndex({}, 0)
+    workers = n_jobs or os.cpu_count()
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        chunks = pd.read_csv(path, chunksize=chunksize, usecols=lambda c: c in columns)
+        for i, chunk in enumerate(chunks):
+            pending.append(pool.submit(sketch_frame, chunk, columns, k, seed + i))
+            # Bounded read-ahead keeps memory at a few chunks
+            if len(pending) > 2 * workers:
+                index.merge(pending.popleft().result())
+        while pending:
+            index.merge(pending.popleft().result())
+    return index
+
+# -------------------------
+# Stored per Data Version
+# -------------------------
+# Sketches depend only on the CSV, so they live in their own directory
+# keyed on its digest: a new data version's sketches can be built while
+# its model is still fitting without touching the artifact directory.
+def sketch_path(data_digest, k=DEFAULT_K):
+    return os.path.join(SKETCH_DIR, f"{data_digest[:16]}-k{k}.npz")
+
+
+def save_sketches(index, target):
+    """Write sketches atomically (temp file + rename)."""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".sketch-", suffix=".npz", dir=os.path.dirname(target))
+    with os.fdopen(fd, "wb") as f:
+        index.save(f)
+    os.replace(tmp_path, target)
+
+
+def load_or_build_sketches(path="data/kaggle.csv", k=DEFAULT_K, **kwargs):
+    """Community sketches of the CSV's current content, built on first use."""
+    target = sketch_path(file_digest(path), k)
+    if os.path.exists(target):
+        return SketchIndex.load(target)
+    index = sketch_csv(path, k=k, **kwargs)
+    try:
+        save_sketches(index, target)
+    except OSError:
+        pass  # read-only store: keep the in-memory sketches
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build community quantile sketches and check them against exact ranks.")
+    parser.add_argument("path", nargs="?", default="data/kaggle.csv")
+    parser.add_argument("-k", type=int, default=DEFAULT_K)
+    parser.add_argument("--chunksize", type=int, default=250_000)
+    parser.add_argument("--save", action="store_true", help="store for the CSV's current data version")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = sketch_csv(args.path, k=args.k, chunksize=args.chunksize)
+    elapsed = time.perf_counter() - start
+    df = pd.read_csv(args.path, usecols=lambda c: c in index.columns)
+    for col in index.columns:
+        values = np.sort(df[col].dropna().to_numpy(dtype=np.float64))
+        probes = np.quantile(values, np.linspace(0.01, 0.99, 99))
+        exact = np.searchsorted(values, probes, side="left") / index.rows
+        est = index.sketches[col].count_below(probes) / index.rows
+        print(f"{col:32s} max rank error {np.abs(est - exact).max():.4f}")
+    print(f"{index.rows:,} rows in {elapsed:.2f}s, {index.nbytes / 1024:.0f} KB of sketches, "
+          f"stated bound ±{index.rank_error:.4f}")
+    if args.save:
+        target = sketch_path(file_digest(args.path), args.k)
+        save_sketches(index, target)
+        print(f"saved {target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# resources.py
+import os
+
+import streamlit as st
+import pandas as pd
+
+from utils import prepare_data
+from columnar_cache import load_compact
+from community_aggregates import build_aggregates
+from community_rank import SortedIndex
+from community_violin import build_violin
+from cohort_index import CohortIndex
+import model_service
+from model_store import file_digest
+from prediction_cache import PredictionCache
+from prediction_lattice import lattice_path, load_lattice
+from quantile_sketch import load_or_build_sketches
+
+# -------------------------
+# Process-wide Shared Resources
+# -------------------------
+# Everything here is built once per data version and shared by every
+# Streamlit session in the process. Callers must treat the returned
+# objects as read-only.
+DATA_PATH = "data/kaggle.csv"
+
+# Above this many rows, percentiles come from the quantile sketches stored
+# per data version (± their rank error) instead of sorted copies
+EXACT_RANK_ROWS = 5_000_000
+
+
+def data_version(path=DATA_PATH):
+    """Content hash of the community CSV (memoised on file stat)."""
+    return file_digest(path)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _community_data(path, version):
+    return load_compact(path)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _feature_matrix(path, version):
+    return prepare_data(_community_data(path, version))
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _community_aggregates(path, version):
+    return build_aggregates(_community_data(path, version))
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _rank_index(path, version):
+    if _community_aggregates(path, version)["rows"] > EXACT_RANK_ROWS:
+        return load_or_build_sketches(path)
+    return SortedIndex(_community_data(path, version))
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _cohort_index(path, version):
+    return CohortIndex(_community_data(path, version), exact_rows=EXACT_RANK_ROWS)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _violin(path, version):
+    return build_violin(_community_data(path, version))
+
+
+def get_community_data(path=DATA_PATH):
+    """Shared community DataFrame (compact dtypes, memory-mapped columns)."""
+    return _community_data(path, data_version(path))
+
+
+def get_community_aggregates(path=DATA_PATH):
+    """Shared community statistics (means, std, quantiles, histograms, counts)."""
+    return _community_aggregates(path, data_version(path))
+
+
+def get_rank_index(path=DATA_PATH):
+    """
+    Shared community percentile index: exact sorted columns, or mergeable
+    quantile sketches once the community outgrows EXACT_RANK_ROWS.
+    """
+    return _rank_index(path, data_version(path))
+
+
+def get_cohort_index(path=DATA_PATH):
+    """Per-cohort aggregates and sorted scores for "people like you" lookups."""
+    return _cohort_index(path, data_version(path))
+
+
+def get_violin(path=DATA_PATH):
+    """Wellness violin summary: density, box and a fixed-size point sample."""
+    return _violin(path, data_version(path))
+
+
+def get_feature_matrix(path=DATA_PATH):
+    """Shared (X, y, features) built from the community DataFrame."""
+    return _feature_matrix(path, data_version(path))
+
+
+def get_model_bundle(path=DATA_PATH):
+    """
+    Shared fitted model and its metrics.
+    When the CSV changes, the previous model keeps serving while the new
+    one trains in the background (see model_service).
+    """
+    version = data_version(path)
+    return model_service.get_bundle(version, path, df=_community_data(path, version))
+
+
+@st.cache_resource(show_spinner=False)
+def _prediction_cache():
+    return PredictionCache()
+
+
+def get_scorer(path=DATA_PATH):
+    """
+    Served model behind the shared quantized-input LRU cache.
+    Swapping in a new model version clears the cache.
+    """
+    bundle = get_model_bundle(path)
+    return _prediction_cache().bind(bundle["predictor"], bundle["version"])
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _lattice(model_version, built):
+    return load_lattice(model_version) if built else None
+
+
+def get_lattice(path=DATA_PATH):
+    """
+    Precomputed prediction lattice of the served model, or None while
+    model_service is still building it for a newly served version.
+    """
+    version = get_model_bundle(path)["version"]
+    return _lattice(version, os.path.exists(lattice_path(version)))
+
+
+def prediction_cache_stats():
+    """Hit/miss/eviction counters of the shared prediction cache."""
+    return _prediction_cache().stats()
+
+
+def model_status():
+    """Version, fit duration and swap timestamp of the served model."""
+    return model_service.status()
+
+# -------------------------
+# Memory Report
+# -------------------------
+def _frame_bytes(obj):
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    return 0
+
+
+def _forest_bytes(model):
+    """Bytes held by the node and value arrays of every tree in a forest."""
+    total = 0
+    for est in getattr(model, "estimators_", []):
+        state = est.tree_.__getstate__()
+        total += state["nodes"].nbytes + state["values"].nbytes
+    return total
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _memory_report(path, version, model_version):
+    df = _community_data(path, version)
+    X, y, _ = _feature_matrix(path, version)
+    model = get_model_bundle(path)["model"]
+    rows = [
+        {"resource": "community_df", "bytes": _frame_bytes(df)},
+        {"resource": "feature_matrix", "bytes": _frame_bytes(X) + _frame_bytes(y)},
+        {"resource": "model", "bytes": _forest_bytes(model)},
+        {"resource": "rank_index", "bytes": _rank_index(path, version).nbytes},
+        {"resource": "cohort_index", "bytes": _cohort_index(path, version).nbytes},
+    ]
+    report = pd.DataFrame(rows)
+    report["MB"] = (report["bytes"] / 1024 ** 2).round(2)
+    return report
+
+
+def resource_memory_report(path=DATA_PATH):
+    """
+    Memory held by each shared resource, in bytes.
+    The numbers are per process, independent of the number of sessions.
+    """
+    return _memory_report(path, data_version(path), get_model_bundle(path)["version"])
@@ -0,0 +1,238 @@
+# streaming_stats.py
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+# -------------------------
+# What the Pages Use
+# -------------------------
+# tab3_welness_map averages these columns, plots the wellness
+# distribution, and the community is broken down by the categorical ones.
+MEAN_COLUMNS = [
+    "screen_time_hours",
+    "work_screen_hours",
+    "leisure_screen_hours",
+    "sleep_hours",
+    "sleep_quality_1_5",
+    "exercise_minutes_per_week",
+    "social_hours_per_week",
+    "stress_level_0_10",
+    "productivity_0_100",
+    "mental_wellness_index_0_100",
+]
+CATEGORY_COLUMNS = ["gender", "occupation", "work_mode"]
+WELLNESS_COLUMN = "mental_wellness_index_0_100"
+WELLNESS_BINS = np.linspace(0.0, 100.0, 101)  # 1-point bins
+
+# -------------------------
+# Mergeable Accumulators
+# -------------------------
+class RunningMoments:
+    """
+    Count, mean, variance, min and max in O(1) memory. Chunks are folded in
+    with Chan et al.'s pairwise form of Welford's update, so partial results
+    from different chunks or workers merge exactly.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        other = RunningMoments()
+        other.count = values.size
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        return self.merge(other)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1), matching pandas' Series.var."""
+        return self.m2 / (self.count - 1) if self.count > 1 else float("nan")
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "std": self.std, "min": self.min, "max": self.max}
+
+
+class Histogram:
+    """Fixed-edge histogram; merging is adding counts."""
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        counts, _ = np.histogram(values[~np.isnan(values)], bins=self.edges)
+        self.counts += counts
+        return self
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+
+class CategoryCounts:
+    """Value counts of one column, merged by adding."""
+
+    def __init__(self):
+        self.counts = {}
+
+    def update(self, values):
+        for key, n in pd.Series(values).value_counts(dropna=False).items():
+            key = "NaN" if pd.isna(key) else str(key)
+            self.counts[key] = self.counts.get(key, 0) + int(n)
+        return self
+
+    def merge(self, other):
+        for key, n in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + n
+        return self
+
+# -------------------------
+# Community Aggregates
+# -------------------------
+class CommunityAggregates:
+    """Every community statistic the pages read, built one chunk at a time."""
+
+    def __init__(self, mean_columns=MEAN_COLUMNS, category_columns=CATEGORY_COLUMNS):
+        self.rows = 0
+        self.moments = {c: RunningMoments() for c in mean_columns}
+        self.categories = {c: CategoryCounts() for c in category_columns}
+        self.wellness_hist = Histogram(WELLNESS_BINS)
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        for col, acc in self.moments.items():
+            if col in chunk.columns:
+                acc.update(chunk[col].to_numpy(dtype=np.float64, na_value=np.nan))
+        for col, acc in self.categories.items():
+            if col in chunk.columns:
+                acc.update(chunk[col])
+        if WELLNESS_COLUMN in chunk.columns:
+            self.wellness_hist.update(chunk[WELLNESS_COLUMN].to_numpy(dtype=np.float64, na_value=np.nan))
+        return self
+
+    def merge(self, other):
+        self.rows += other.rows
+        for col, acc in self.moments.items():
+            acc.merge(other.moments[col])
+        for col, acc in self.categories.items():
+            acc.merge(other.categories[col])
+        self.wellness_hist.merge(other.wellness_hist)
+        return self
+
+    def means(self):
+        return {col: acc.mean for col, acc in self.moments.items() if acc.count}
+
+    def to_dict(self):
+        return {
+            "rows": self.rows,
+            "moments": {col: acc.to_dict() for col, acc in self.moments.items()},
+            "categories": {col: acc.counts for col, acc in self.categories.items()},
+            "wellness_hist": {
+                "edges": self.wellness_hist.edges.tolist(),
+                "counts": self.wellness_hist.counts.tolist(),
+            },
+        }
+
+# -------------------------
+# Bounded Training Sample
+# -------------------------
+class PrioritySample:
+    """
+    Uniform sample of at most `size` rows: every row draws a random key
+    and the `size` smallest keys are kept. Memory stays at `size` rows, and
+    two samples merge by keeping the smallest keys of both.
+    """
+
+    def __init__(self, size, seed=42):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.frame = None
+        self.keys = np.empty(0)
+
+    def update(self, chunk):
+        keys = self.rng.random(len(chunk))
+        frame = chunk if self.frame is None else pd.concat([self.frame, chunk], ignore_index=True)
+        keys = np.concatenate([self.keys, keys])
+        if len(keys) > self.size:
+            keep = np.argpartition(keys, self.size)[: self.size]
+            frame, keys = frame.iloc[keep].reset_index(drop=True), keys[keep]
+        self.frame, self.keys = frame, keys
+        return self
+
+    def result(self):
+        if self.frame is None:
+            return pd.DataFrame()
+        return self.frame.iloc[np.argsort(self.keys, kind="stable")].reset_index(drop=True)
+
+# -------------------------
+# Streaming Loader
+# -------------------------
+def stream_community(path="data/kaggle.csv", chunksize=250_000, sample_size=None, sample_path=None, seed=42):
+    """
+    One pass over a community CSV of any size in bounded memory.
+    Returns CommunityAggregates; with `sample_size`, also writes a uniform
+    random sample of that many rows to `sample_path` for model training.
+    """
+    aggregates = CommunityAggregates()
+    sample = PrioritySample(sample_size, seed=seed) if sample_size else None
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        aggregates.update(chunk)
+        if sample is not None:
+            sample.update(chunk)
+    if sample is not None and sample_path:
+        sample.result().to_csv(sample_path, index=False)
+    return aggregates
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a community CSV and print its aggregates as JSON.")
+    parser.add_argument("path", nargs="?", default="data/kaggle.csv")
+    parser.add_argument("--chunksize", type=int, default=250_000)
+    parser.add_argument("--sample", type=int, help="rows to sample for training")
+    parser.add_argument("--sample-out", default="data/community_sample.csv")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    aggregates = stream_community(
+        args.path, chunksize=args.chunksize, sample_size=args.sample,
+        sample_path=args.sample_out if args.sample else None,
+    )
+    summary = aggregates.to_dict()
+    summary["wellness_hist"] = f"{len(summary['wellness_hist']['counts'])} bins"
+    print(json.dumps(summary, indent=2))
+    print(f"{aggregates.rows:,} rows in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,18 @@ import streamlit as st
 import numpy as np
 import pandas as pd
 from datetime import datetime
-import os
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+import history_cache
+import history_store
+
 # ==========================
-# Folder & File CSV
+# Riwayat (SQLite history store)
 # ==========================
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_FOLDER = os.path.join(BASE_DIR, "data")
-CSV_FILE = os.path.join(DATA_FOLDER, "user_daily_data.csv")
-
-os.makedirs(DATA_FOLDER, exist_ok=True)
+# The history section only shows the latest entries with a score
+HISTORY_ROWS = 5
 
 # ==========================
 # Custom CSS & Components
@@ -299,7 +298,7 @@ def save_user_data(user_input, predicted_wellness):
     try:
         # Format date sebagai string untuk konsistensi
         current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        df_new = pd.DataFrame([{
+        record = {
             "date": current_date,
             "screen_time_hours": user_input[0][0],
             "work_screen_hours": user_input[0][1],
@@ -309,17 +308,12 @@ def save_user_data(user_input, predicted_wellness):
             "stress_level": user_input[0][5],
             "productivity": user_input[0][6],
             "predicted_wellness": predicted_wellness
-        }])
+        }
 
-        # Simpan ke CSV
-        if not os.path.exists(CSV_FILE):
-            df_new.to_csv(CSV_FILE, index=False)
-        else:
-            # Append ke file existing
-            df_new.to_csv(CSV_FILE, mode='a', header=False, index=False)
-        
-        # Force reload data dari CSV
-        st.session_state.df_user_history = load_user_data()
+        # Antrekan ke penulis batch (tanpa menunggu disk); riwayat di memori cukup ditambah satu baris
+        history = user_history()
+        history.append(record)
+        st.session_state.df_user_history = history.frame()
         
         st.success("✅ Data harian berhasil disimpan!")
         return True
@@ -330,23 +324,27 @@ def save_user_data(user_input, predicted_wellness):
 # ==========================
 # Load Data User
 # ==========================
-def load_user_data():
-    if os.path.exists(CSV_FILE):
-        try:
-            df = pd.read_csv(CSV_FILE)
-            # Pastikan kolom date dalam format datetime
-            if 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'], errors='coerce')
-                # Hapus row dengan date invalid
-                df = df.dropna(subset=['date'])
-                # Sort by date descending untuk memastikan data terbaru di atas
-                df = df.sort_values('date', ascending=False)
-            return df
-        except Exception as e:
-            st.warning(f"⚠️ Gagal membaca file CSV: {e}")
-            return pd.DataFrame()
-    else:
-        return pd.DataFrame()
+def _prepare_history(df):
+    # Pastikan kolom date dalam format datetime
+    df = df.copy()
+    df['date'] = pd.to_datetime(df['date'], errors='coerce', format='mixed')
+    # Hapus row dengan date invalid
+    df = df.dropna(subset=['date'])
+    # Sort by date descending untuk memastikan data terbaru di atas
+    return df.sort_values('date', ascending=False)
+
+def user_history():
+    """Riwayat terbaru user aktif di memori, diperbarui per baris saat menyimpan"""
+    username = history_store.session_user()
+    history = st.session_state.get("history_cache")
+    if history is None or history.username != username:
+        # Reloads read the shared parsed history (also used by Digital Compass)
+        history = history_store.RecentHistory(
+            "daily", username, HISTORY_ROWS, require=("predicted_wellness",), prepare=_prepare_history,
+            source=history_cache.cached_history,
+        )
+        st.session_state.history_cache = history
+    return history
 
 # ==========================
 # Create Beautiful HTML Table Function
@@ -438,8 +436,12 @@ def run(model):
     # --------------------------
     # Initialize Session State
     # --------------------------
-    if "df_user_history" not in st.session_state:
-        st.session_state.df_user_history = load_user_data()
+    # Riwayat milik user yang sedang aktif (query ulang hanya jika ada penulis lain)
+    try:
+        st.session_state.df_user_history = user_history().frame()
+    except Exception as e:
+        st.warning(f"⚠️ Gagal membaca riwayat: {e}")
+        st.session_state.df_user_history = pd.DataFrame()
     
     if "screen_time_hours" not in st.session_state:
         st.session_state.screen_time_hours = 8.0
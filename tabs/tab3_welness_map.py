@@ -4,6 +4,10 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import numpy as np
+from community_aggregates import build_aggregates, column_mean
+from community_rank import SortedIndex
+from cohort_index import CohortIndex
+from community_violin import build_violin, violin_figure
 
 def apply_wellness_css():
     st.markdown("""
@@ -316,10 +320,93 @@ def comparison_gauge(user_value, avg_value, max_value, title, color="#0EA5E9", r
     
     return fig
 
-def run(df=None, model=None):
+def what_if_panel(lattice, scorer=None):
+    """
+    What-if explorer answered from the precomputed prediction lattice.
+    With a scorer, the current score is the model's own (as on Pulse Check)
+    and the lattice only supplies the change from it.
+    """
+    base = np.array([
+        st.session_state.get('screen_time_hours', 8.0),
+        st.session_state.get('work_screen_hours', 4.0),
+        st.session_state.get('leisure_screen_hours', 4.0),
+        st.session_state.get('sleep_hours', 7.0),
+        st.session_state.get('sleep_quality', 8),
+        st.session_state.get('stress_level', 5),
+        st.session_state.get('productivity', 70),
+    ], dtype=float)
+
+    slider_cols = st.columns(4)
+    with slider_cols[0]:
+        d_sleep = st.slider("Δ Jam Tidur", -3.0, 3.0, 0.0, 0.5, key="whatif_sleep")
+    with slider_cols[1]:
+        d_screen = st.slider("Δ Waktu Layar", -6.0, 6.0, 0.0, 0.5, key="whatif_screen")
+    with slider_cols[2]:
+        d_stress = st.slider("Δ Tingkat Stres", -5, 5, 0, 1, key="whatif_stress")
+    with slider_cols[3]:
+        d_productivity = st.slider("Δ Produktivitas", -30, 30, 0, 5, key="whatif_productivity")
+
+    scenario = base.copy()
+    scenario[0] += d_screen
+    # Extra or fewer screen hours are treated as leisure screen time
+    scenario[2] += d_screen
+    scenario[3] += d_sleep
+    scenario[5] += d_stress
+    scenario[6] += d_productivity
+
+    lattice_base, lattice_scenario = lattice.lookup(np.vstack([base, scenario]))
+    base_score = float(scorer.predict(base)[0]) if scorer is not None else lattice_base
+    # Interpolation error is mostly shared by nearby points, so the lattice
+    # curve is shifted to pass through the exact current score
+    offset = base_score - lattice_base
+    scenario_score = lattice_scenario + offset
+    diff = scenario_score - base_score
+    diff_color = "#10B981" if diff >= 0 else "#EF4444"
+
+    card_cols = st.columns([1, 1, 2])
+    with card_cols[0]:
+        wellness_card("📍", "Skor Saat Ini", f"{base_score:.1f}", "Perkiraan dari input Pulse Check", "#0EA5E9")
+    with card_cols[1]:
+        wellness_card("🔮", "Skor What-If", f"{scenario_score:.1f}", f"{diff:+.1f} poin dari saat ini", diff_color)
+    with card_cols[2]:
+        sleep_axis = np.arange(3.0, 12.01, 0.5)
+        sweep = np.repeat(scenario[None, :], len(sleep_axis), axis=0)
+        sweep[:, 3] = sleep_axis
+        fig = go.Figure(go.Scatter(
+            x=sleep_axis, y=lattice.lookup(sweep) + offset, mode="lines",
+            line=dict(color="#8B5CF6", width=3), name="Wellness"
+        ))
+        fig.add_vline(x=scenario[3], line_dash="dash", line_color="#F59E0B")
+        fig.update_layout(
+            title="Wellness vs Jam Tidur (skenario what-if)",
+            xaxis_title="Jam Tidur",
+            yaxis_title="Wellness Score",
+            height=280,
+            margin=dict(l=40, r=20, t=50, b=40),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(color='white'),
+            title_font_color='white'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+def run(df=None, model=None, lattice=None, aggregates=None, rank_index=None, cohort_index=None,
+        violin=None, scorer=None):
     # Apply custom CSS
     apply_wellness_css()
 
+    # Community numbers come from the per-data-version aggregates;
+    # build them here only when the caller did not pass them in
+    if aggregates is None and df is not None and not df.empty:
+        aggregates = build_aggregates(df)
+    if rank_index is None and df is not None and not df.empty:
+        rank_index = SortedIndex(df)
+    if cohort_index is None and df is not None and not df.empty:
+        cohort_index = CohortIndex(df)
+    if violin is None and df is not None and not df.empty and "mental_wellness_index_0_100" in df.columns:
+        violin = build_violin(df)
+    has_community = bool(aggregates and aggregates["rows"])
+
     # ==========================
     # Hero Header
     # ==========================
@@ -445,7 +532,7 @@ def run(df=None, model=None):
         radar_user_values[4] = 100 - radar_user_values[4]  # Stres
 
         # Get community averages if available
-        if df is not None and not df.empty:
+        if has_community:
             column_mapping = {
                 "Total Waktu Layar": "screen_time_hours",
                 "Waktu Layar Kerja": "work_screen_hours",
@@ -457,7 +544,7 @@ def run(df=None, model=None):
                 "Tingkat Stres": "stress_level_0_10",
                 "Produktivitas": "productivity_0_100"
             }
-            avg_data = {k: df[col].mean() if col in df.columns else user_data[k] for k, col in column_mapping.items()}
+            avg_data = {k: column_mean(aggregates, col, user_data[k]) for k, col in column_mapping.items()}
             
             radar_avg_values = [
                 (avg_data["Total Waktu Layar"] / radar_max_values["Screen Time"]) * 100,
@@ -601,7 +688,7 @@ def run(df=None, model=None):
     # ==========================
     # Detailed Comparison Section - DIPERBAIKI BESAR
     # ==========================
-    if df is not None and not df.empty:
+    if has_community:
         st.markdown("---")
         st.markdown('<div class="section-header"><h3>📈 Analisis Komparatif Mendalam</h3></div>', unsafe_allow_html=True)
         
@@ -765,22 +852,18 @@ def run(df=None, model=None):
     # ==========================
     # Community Wellness Distribution
     # ==========================
-    if df is not None and not df.empty and "mental_wellness_index_0_100" in df.columns:
+    if has_community and violin is not None:
         st.markdown("---")
         st.markdown('<div class="section-header"><h3>🌍 Perspektif Komunitas</h3></div>', unsafe_allow_html=True)
         
         comm_cols = st.columns([2, 1])
         
         with comm_cols[0]:
-            avg_wellness = df["mental_wellness_index_0_100"].mean()
+            avg_wellness = column_mean(aggregates, "mental_wellness_index_0_100")
             
-            fig_violin = px.violin(
-                df, 
-                y="mental_wellness_index_0_100", 
-                box=True, 
-                points="all",
-                title="Distribusi Kesejahteraan Mental Komunitas"
-            )
+            # Density and a capped point sample computed server-side, so the
+            # chart payload does not grow with the community
+            fig_violin = violin_figure(violin, title="Distribusi Kesejahteraan Mental Komunitas")
             
             if predicted_wellness is not None:
                 fig_violin.add_hline(
@@ -814,10 +897,12 @@ def run(df=None, model=None):
             st.markdown("#### 📊 Posisi Anda dalam Komunitas")
             
             if predicted_wellness:
-                percentile = (df["mental_wellness_index_0_100"] < predicted_wellness).mean() * 100
+                percentile = rank_index.percentile("mental_wellness_index_0_100", predicted_wellness)
                 
+                # Sketch-based ranks carry a stated error bound
+                margin = f" (±{rank_index.rank_error * 100:.1f})" if rank_index.rank_error else ""
                 wellness_card("🏆", "Peringkat Komunitas", f"Top {100-percentile:.1f}%", 
-                            f"Lebih baik dari {percentile:.1f}% anggota", "#F59E0B")
+                            f"Lebih baik dari {percentile:.1f}%{margin} anggota", "#F59E0B")
                 
                 diff = predicted_wellness - avg_wellness
                 diff_color = "#10B981" if diff > 0 else "#EF4444"
@@ -828,6 +913,50 @@ def run(df=None, model=None):
                             f"Rata-rata komunitas: {avg_wellness:.1f}", 
                             diff_color)
 
+            # "People like you": finest sidebar-profile cohort with enough members
+            cohort = cohort_index.lookup(st.session_state.get("user_profile")) if cohort_index else None
+            if predicted_wellness and cohort:
+                cohort_avg = column_mean(cohort["aggregates"], "mental_wellness_index_0_100", avg_wellness)
+                cohort_percentile = cohort["rank"].percentile("mental_wellness_index_0_100", predicted_wellness)
+                wellness_card("👥", "Orang Seperti Anda",
+                            f"Top {100-cohort_percentile:.1f}%",
+                            f"{cohort['label']} ({cohort['rows']:,} orang) • rata-rata {cohort_avg:.1f}",
+                            "#8B5CF6")
+
+            # Rank on every radar dimension (binary search, no scan)
+            radar_columns = {
+                "Screen Time": ("screen_time_hours", "Total Waktu Layar"),
+                "Tidur": ("sleep_hours", "Jam Tidur"),
+                "Olahraga": ("exercise_minutes_per_week", "Menit Olahraga"),
+                "Sosialisasi": ("social_hours_per_week", "Jam Bersosialisasi"),
+                "Stres": ("stress_level_0_10", "Tingkat Stres"),
+                "Produktivitas": ("productivity_0_100", "Produktivitas"),
+            }
+            ranks = rank_index.percentiles({col: user_data[key] for col, key in radar_columns.values()})
+            rank_lines = "".join(
+                f'<li style="color: #e2e8f0 !important;">{label}: di atas {ranks[col]:.1f}% anggota</li>'
+                for label, (col, _) in radar_columns.items() if col in ranks
+            )
+            if rank_lines:
+                st.markdown(f"""
+                <div class="insight-card" style="border-left: 4px solid #8B5CF6">
+                    <strong>📐 Peringkat per Dimensi</strong>
+                    <ul style="margin: 0.5rem 0 0 0; padding-left: 1.2rem;">{rank_lines}</ul>
+                </div>
+                """, unsafe_allow_html=True)
+
+    # ==========================
+    # What-If Explorer
+    # ==========================
+    if lattice is not None or scorer is not None:
+        st.markdown("---")
+        st.markdown('<div class="section-header"><h3>🔮 What-If Explorer</h3></div>', unsafe_allow_html=True)
+        if lattice is not None:
+            what_if_panel(lattice, scorer)
+        else:
+            # A newly swapped-in model gets its lattice built in the background
+            st.info("🔄 What-If Explorer sedang disiapkan untuk model terbaru. Muat ulang halaman sebentar lagi.")
+
     # ==========================
     # Action Plan
     # ==========================
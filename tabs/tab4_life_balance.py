@@ -4,76 +4,36 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import calendar
-import os
-import csv
 
-def load_activities_from_csv():
-    """Load activities from CSV file with error handling"""
-    csv_file = "data/activities.csv"
-    
+import history_store
+from activity_planner import ActivityPlanner
+
+def load_activities_from_csv(username=None):
+    """Load one user's activities from the history store into an indexed planner"""
+    if username is None:
+        username = history_store.session_user()
     try:
-        # Create directory if not exists
-        os.makedirs("data", exist_ok=True)
-        
-        # Check if CSV file exists
-        if not os.path.exists(csv_file):
-            # Return empty list if file doesn't exist
-            print(f"❌ CSV file not found: {csv_file}")
-            return []
+        df = history_store.history("activities", username=username, newest_first=False)
         
-        # Load CSV
-        df = pd.read_csv(csv_file)
-        
-        # Convert to list of dictionaries and ensure data types
-        activities = []
-        for _, row in df.iterrows():
-            activity = {
-                "tanggal": str(row["tanggal"]),
-                "aktivitas": str(row["aktivitas"]),
-                "kategori": str(row["kategori"]),
-                "durasi": int(row["durasi"]),
-                "intensitas": int(row["intensitas"]),
-                "catatan": str(row["catatan"]) if pd.notna(row["catatan"]) else "",
-                "created_at": str(row["created_at"])
-            }
-            activities.append(activity)
+        # Typed columns with date, ISO week and category indexes
+        planner = ActivityPlanner(df)
         
-        print(f"✅ Loaded {len(activities)} activities from {csv_file}")
-        return activities
+        print(f"✅ Loaded {len(planner)} activities from {history_store.DB_PATH}")
+        return planner
         
     except Exception as e:
-        print(f"❌ Error loading CSV: {e}")
-        # Return empty list if error
-        return []
+        print(f"❌ Error loading activities: {e}")
+        # Return empty planner if error
+        return ActivityPlanner()
 
 def save_activity_to_csv(activity):
-    """Save single activity to CSV"""
-    csv_file = "data/activities.csv"
-    
-    # Create data directory if not exists
-    os.makedirs("data", exist_ok=True)
-    
-    # Create file with headers if not exists
-    if not os.path.exists(csv_file):
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=activity.keys())
-            writer.writeheader()
-    
-    # Append activity to CSV
-    with open(csv_file, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=activity.keys())
-        writer.writerow(activity)
+    """Queue a single activity for the history store's batched writer"""
+    history_store.submit("activities", [activity], username=history_store.session_user())
 
 def save_all_activities_to_csv(activities):
-    """Save all activities to CSV (overwrite)"""
-    csv_file = "data/activities.csv"
-    
-    # Create data directory if not exists
-    os.makedirs("data", exist_ok=True)
-    
+    """Queue all activities for the history store (overwrite)"""
     if activities:
-        df = pd.DataFrame(activities)
-        df.to_csv(csv_file, index=False)
+        history_store.submit("activities", activities, username=history_store.session_user(), replace=True)
 
 def apply_balance_css():
     st.markdown("""
@@ -457,8 +417,11 @@ def run(model=None):
     # ==========================
     # Initialize Session State
     # ==========================
-    if "planner" not in st.session_state:
+    # Activities of the signed-in user (reloaded when the name changes)
+    if (st.session_state.get("planner_owner") != history_store.session_user()
+            or not isinstance(st.session_state.get("planner"), ActivityPlanner)):
         st.session_state["planner"] = load_activities_from_csv()
+        st.session_state["planner_owner"] = history_store.session_user()
 
     # ==========================
     # Hero Header
@@ -519,7 +482,7 @@ def run(model=None):
     with data_cols[1]:
         if st.button("📥 Export ke CSV", use_container_width=True):
             if st.session_state.planner:
-                df = pd.DataFrame(st.session_state.planner)
+                df = st.session_state.planner.frame()
                 csv_data = df.to_csv(index=False)
                 st.download_button(
                     label="⬇️ Download CSV",
@@ -533,6 +496,7 @@ def run(model=None):
     
     with data_cols[2]:
         if st.button("🔄 Sync dengan CSV", use_container_width=True):
+            history_store.flush(timeout=5)  # simpanan yang masih antre ikut terbaca
             st.session_state.planner = load_activities_from_csv()
             st.success("✅ Data berhasil disinkronisasi dengan CSV!")
             st.rerun()
@@ -724,11 +688,11 @@ def run(model=None):
     # ==========================
     st.markdown('<div class="section-header"><h3>🎯 Progress Mingguan</h3></div>', unsafe_allow_html=True)
     
-    # Calculate weekly progress
-    weekly_activities = [act for act in st.session_state.get("planner", []) 
-                        if datetime.strptime(act["tanggal"], "%Y-%m-%d") >= datetime.now() - timedelta(days=7)]
+    # Calculate weekly progress (activities dated within the last 7 days or later)
+    planner = st.session_state["planner"]
+    weekly_activities = planner.between((datetime.now() - timedelta(days=6)).date())
     
-    total_weekly_minutes = sum(act["durasi"] for act in weekly_activities)
+    total_weekly_minutes = planner.total_minutes(weekly_activities)
     weekly_goal = 300  # 5 hours per week
     
     progress_cols = st.columns(3)
@@ -744,8 +708,7 @@ def run(model=None):
     with progress_cols[1]:
         st.markdown('<div class="gauge-title">Relaksasi</div>', unsafe_allow_html=True)
         st.markdown('<div class="progress-card">', unsafe_allow_html=True)
-        relaxation_activities = [act for act in weekly_activities if act["kategori"] in ["Relaxation", "Sleep"]]
-        relaxation_minutes = sum(act["durasi"] for act in relaxation_activities)
+        relaxation_minutes = planner.total_minutes(weekly_activities, ["Relaxation", "Sleep"])
         st.plotly_chart(progress_chart(
             relaxation_minutes, 180, "Relaksasi"
         ), use_container_width=True)
@@ -754,15 +717,14 @@ def run(model=None):
     with progress_cols[2]:
         st.markdown('<div class="gauge-title">Aktivitas Fisik</div>', unsafe_allow_html=True)
         st.markdown('<div class="progress-card">', unsafe_allow_html=True)
-        physical_activities = [act for act in weekly_activities if act["kategori"] in ["Physical"]]
-        physical_minutes = sum(act["durasi"] for act in physical_activities)
+        physical_minutes = planner.total_minutes(weekly_activities, ["Physical"])
         st.plotly_chart(progress_chart(
             physical_minutes, 150, "Aktivitas Fisik"
         ), use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
 
     # Progress summary
-    if weekly_activities:
+    if len(weekly_activities):
         completion_rate = (total_weekly_minutes / weekly_goal * 100) if weekly_goal > 0 else 0
         st.markdown(f"""
         <div class="recommendation-card" style="--rec-color: #0EA5E9">
@@ -898,22 +860,18 @@ def run(model=None):
         with filter_cols[0]:
             search_term = st.text_input("🔍 Cari aktivitas...", placeholder="Ketik nama aktivitas...")
         with filter_cols[1]:
-            categories = list(set(act["kategori"] for act in st.session_state["planner"]))
+            categories = planner.categories()
             category_filter = st.selectbox("Kategori", ["Semua"] + categories)
         with filter_cols[2]:
             intensity_filter = st.selectbox("Intensitas", ["Semua", "1", "2", "3", "4", "5"])
 
-        # Filter activities
-        filtered_activities = st.session_state["planner"]
-        if search_term:
-            filtered_activities = [act for act in filtered_activities if search_term.lower() in act["aktivitas"].lower()]
-        if category_filter != "Semua":
-            filtered_activities = [act for act in filtered_activities if act["kategori"] == category_filter]
-        if intensity_filter != "Semua":
-            filtered_activities = [act for act in filtered_activities if act["intensitas"] == int(intensity_filter)]
-
-        # Sort by date
-        filtered_activities.sort(key=lambda x: x["tanggal"], reverse=True)
+        # Filter activities (index lookups, newest first)
+        filtered_pos = planner.filter(
+            search_term,
+            kategori=None if category_filter == "Semua" else category_filter,
+            intensitas=None if intensity_filter == "Semua" else int(intensity_filter),
+        )
+        filtered_activities = planner.records(filtered_pos)
 
         # Display activities
         for activity in filtered_activities:
@@ -934,15 +892,15 @@ def run(model=None):
             st.metric("Total Aktivitas", total_activities)
         
         with summary_cols[1]:
-            total_minutes = sum(act["durasi"] for act in filtered_activities)
+            total_minutes = planner.total_minutes(filtered_pos)
             st.metric("Total Menit", total_minutes)
         
         with summary_cols[2]:
-            avg_intensity = sum(act["intensitas"] for act in filtered_activities) / len(filtered_activities) if filtered_activities else 0
+            avg_intensity = planner.mean_intensity(filtered_pos)
             st.metric("Rata-rata Intensitas", f"{avg_intensity:.1f}")
         
         with summary_cols[3]:
-            upcoming_activities = len([act for act in filtered_activities if act["tanggal"] >= datetime.now().strftime("%Y-%m-%d")])
+            upcoming_activities = planner.count_from(filtered_pos, datetime.now().date())
             st.metric("Aktivitas Mendatang", upcoming_activities)
 
     # ==========================
@@ -1057,13 +1015,12 @@ def run(model=None):
         suggested_activities = []
         
         # Suggest based on current activities distribution
-        if st.session_state["planner"]:
-            categories = [act["kategori"] for act in st.session_state["planner"]]
-            category_count = {cat: categories.count(cat) for cat in set(categories)}
+        if planner:
+            category_count = planner.category_totals["count"]
             
             # Find least frequent category
-            if category_count:
-                least_category = min(category_count, key=category_count.get)
+            if len(category_count):
+                least_category = category_count.idxmin()
                 if least_category == "Physical":
                     suggested_activities.append("💪 Coba tambahkan olahraga ringan 3x seminggu")
                 elif least_category == "Social":
@@ -1119,9 +1076,10 @@ def run(model=None):
         start_of_week = today - timedelta(days=today.weekday())
         week_dates = [(start_of_week + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)]
         
-        week_activities = {}
-        for date in week_dates:
-            week_activities[date] = [act for act in st.session_state["planner"] if act["tanggal"] == date]
+        week_activities = {date: [] for date in week_dates}
+        iso_year, iso_week, _ = today.isocalendar()
+        for act in planner.records(planner.in_week(iso_year, iso_week)):
+            week_activities[act["tanggal"]].append(act)
         
         # Create weekly calendar
         days = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
@@ -5,17 +5,18 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
-import os
 
-def create_sample_digital_compass_data():
+import history_cache
+import history_store
+
+# Progress tracking shows at most the latest 10 assessments
+COMPASS_HISTORY_ROWS = 10
+
+def create_sample_digital_compass_data(username=None):
     """Create sample digital compass data for demonstration"""
+    if username is None:
+        username = history_store.session_user()
     try:
-        BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        DATA_FOLDER = os.path.join(BASE_DIR, "data")
-        COMPASS_CSV = os.path.join(DATA_FOLDER, "digital_compass_data.csv")
-        
-        os.makedirs(DATA_FOLDER, exist_ok=True)
-        
         # Create sample data for November 15-20, 2025
         sample_data = []
         
@@ -62,36 +63,28 @@ def create_sample_digital_compass_data():
             }
             sample_data.append(record)
         
-        df = pd.DataFrame(sample_data)
-        df.to_csv(COMPASS_CSV, index=False)
+        # Through the batched writer like every other save; wait, the caller reads it back
+        history_store.submit("compass", sample_data, username=username).result(timeout=10)
         return True
     except Exception as e:
         st.error(f"Error creating sample data: {e}")
         return False
 
-def load_pulse_check_data():
-    """Load data from pulse check CSV file"""
+def load_pulse_check_data(limit=None, username=None):
+    """Load the user's latest pulse check entries (all with limit=None), newest first"""
+    if username is None:
+        username = history_store.session_user()
     try:
-        BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        DATA_FOLDER = os.path.join(BASE_DIR, "data")
-        CSV_FILE = os.path.join(DATA_FOLDER, "user_daily_data.csv")
-        
-        if os.path.exists(CSV_FILE):
-            df = pd.read_csv(CSV_FILE)
-            # Convert date column to datetime
-            if 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'], errors='coerce')
-                df = df.dropna(subset=['date'])
-                df = df.sort_values('date', ascending=False)
-            return df
-        return pd.DataFrame()
+        # Shared parsed history; slice instead of mutating it
+        df = history_cache.cached_history("daily", username)
+        return df.copy() if limit is None else df.head(limit).copy()
     except Exception as e:
         st.error(f"Error loading pulse check data: {e}")
         return pd.DataFrame()
 
 def get_integrated_metrics():
     """Get integrated metrics from pulse check data"""
-    df = load_pulse_check_data()
+    df = load_pulse_check_data(limit=5)
     
     if df.empty:
         return {
@@ -124,12 +117,6 @@ def get_integrated_metrics():
 def save_digital_compass_data(assessment_data, usage_data):
     """Save digital compass data to CSV"""
     try:
-        BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        DATA_FOLDER = os.path.join(BASE_DIR, "data")
-        COMPASS_CSV = os.path.join(DATA_FOLDER, "digital_compass_data.csv")
-        
-        os.makedirs(DATA_FOLDER, exist_ok=True)
-        
         # Prepare data for saving
         current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
@@ -176,40 +163,27 @@ def save_digital_compass_data(assessment_data, usage_data):
                                    if assessment_data["scores"][i]["category"] == "Self-Esteem")
         }
         
-        df_new = pd.DataFrame([record])
-        
-        if not os.path.exists(COMPASS_CSV):
-            df_new.to_csv(COMPASS_CSV, index=False)
-            st.success("✅ Digital Compass data saved successfully! Created new file.")
-        else:
-            df_new.to_csv(COMPASS_CSV, mode='a', header=False, index=False)
-            st.success("✅ Digital Compass data saved successfully!")
+        history_store.submit("compass", [record], username=history_store.session_user())
+        st.success("✅ Digital Compass data saved successfully!")
         
         return True
     except Exception as e:
         st.error(f"❌ Error saving digital compass data: {e}")
         return False
 
-def load_digital_compass_history():
-    """Load digital compass data from CSV"""
+def load_digital_compass_history(limit=COMPASS_HISTORY_ROWS, username=None):
+    """Load the user's latest digital compass entries, newest first"""
+    if username is None:
+        username = history_store.session_user()
     try:
-        BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        DATA_FOLDER = os.path.join(BASE_DIR, "data")
-        COMPASS_CSV = os.path.join(DATA_FOLDER, "digital_compass_data.csv")
-        
-        # Create sample data if file doesn't exist
-        if not os.path.exists(COMPASS_CSV):
-            create_sample_digital_compass_data()
+        # Create sample data on a fresh install (nobody has any history yet)
+        df = history_cache.cached_history("compass", username)
+        if df.empty and history_store.last_id("compass") == 0:
+            create_sample_digital_compass_data(username)
             st.info("📊 Sample Digital Compass data created for demonstration!")
+            df = history_cache.cached_history("compass", username)
         
-        if os.path.exists(COMPASS_CSV):
-            df = pd.read_csv(COMPASS_CSV)
-            if 'date' in df.columns:
-                df['date'] = pd.to_datetime(df['date'], errors='coerce')
-                df = df.dropna(subset=['date'])
-                df = df.sort_values('date', ascending=False)
-            return df
-        return pd.DataFrame()
+        return df.head(limit).copy()
     except Exception as e:
         st.error(f"Error loading digital compass data: {e}")
         return pd.DataFrame()
@@ -885,8 +859,10 @@ def run(df=None, metrics=None):
         st.session_state.digital_usage_history = []
     if 'fomo_questions' not in st.session_state:
         st.session_state.fomo_questions = []
-    if 'compass_df' not in st.session_state:
+    # History of the signed-in user (reloaded when the name changes)
+    if st.session_state.get('compass_df_owner') != history_store.session_user():
         st.session_state.compass_df = load_digital_compass_history()
+        st.session_state.compass_df_owner = history_store.session_user()
     
     # Load integrated metrics from pulse check
     pulse_metrics = get_integrated_metrics()
@@ -1068,7 +1044,8 @@ def run(df=None, metrics=None):
                     # Save button
                     if st.button("💾 Save Complete Session Data", use_container_width=True, key="save_session_btn"):
                         if save_digital_compass_data(latest_assessment, latest_usage):
-                            # Reload the history
+                            # Reload the history once the queued save is committed
+                            history_store.flush(timeout=5)
                             st.session_state.compass_df = load_digital_compass_history()
                             st.rerun()
                 
@@ -0,0 +1,136 @@
+# tuning.py
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV, KFold, train_test_split
+
+from model_store import DEFAULT_TRAIN_PARAMS, STORE_DIR, file_digest, save_tuned_params
+from utils import load_data, prepare_data
+
+# -------------------------
+# Search Space
+# -------------------------
+# Successive halving spends trees as its resource: every candidate starts
+# with a few trees, and only the best third move on to three times as many.
+PARAM_GRID = {
+    "max_depth": [None, 8, 12, 16],
+    "min_samples_leaf": [1, 2, 4],
+    "max_features": [1.0, 0.6, "sqrt"],
+}
+
+FOLD_DIR = os.path.join(STORE_DIR, "folds")
+
+# -------------------------
+# Cached CV Folds
+# -------------------------
+def cv_folds(X, data_digest, n_splits=5, random_state=42):
+    """
+    K-fold (train, test) index pairs, cached on disk per data version so
+    repeated tuning runs and every halving round reuse the same folds.
+    """
+    path = os.path.join(FOLD_DIR, f"{data_digest[:16]}-k{n_splits}-rs{random_state}.npz")
+    if os.path.exists(path):
+        with np.load(path) as f:
+            return [(f[f"train_{i}"], f[f"test_{i}"]) for i in range(n_splits)]
+
+    folds = list(KFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(X))
+    os.makedirs(FOLD_DIR, exist_ok=True)
+    arrays = {}
+    for i, (train, test) in enumerate(folds):
+        arrays[f"train_{i}"], arrays[f"test_{i}"] = train, test
+    np.savez(path, **arrays)
+    return folds
+
+
+def training_matrix(path, target="mental_wellness_index_0_100"):
+    """
+    Training split of train_model as one float32, C-contiguous matrix.
+    Trees work on float32 internally, so converting once here saves a
+    validation copy in every one of the search's fits.
+    """
+    X, y, features = prepare_data(load_data(path), target=target)
+    X_train, _, y_train, _ = train_test_split(
+        X, y,
+        test_size=DEFAULT_TRAIN_PARAMS["test_size"],
+        random_state=DEFAULT_TRAIN_PARAMS["random_state"],
+    )
+    X32 = np.ascontiguousarray(X_train.to_numpy(dtype=np.float32))
+    return X32, y_train.to_numpy(dtype=np.float64), features
+
+# -------------------------
+# Successive-Halving Search
+# -------------------------
+def tune(path="data/kaggle.csv", param_grid=PARAM_GRID, n_splits=5, factor=3,
+         min_trees=30, max_trees=300, n_jobs=-1, tolerance=0.005):
+    """
+    Successive-halving search over forest hyperparameters on a process
+    pool (n_jobs=-1: every core), using trees as the halving resource.
+
+    The winner is the candidate of the final round with the lowest
+    predict time whose R2 is within `tolerance` of the best, i.e. the
+    best accuracy per millisecond. Returns (winner params, table).
+    """
+    X, y, _ = training_matrix(path)
+    folds = cv_folds(X, file_digest(path), n_splits=n_splits)
+
+    search = HalvingGridSearchCV(
+        RandomForestRegressor(random_state=DEFAULT_TRAIN_PARAMS["random_state"]),
+        param_grid,
+        resource="n_estimators",
+        min_resources=min_trees,
+        max_resources=max_trees,
+        factor=factor,
+        cv=folds,
+        scoring="r2",
+        n_jobs=n_jobs,
+        refit=False,
+    )
+    start = time.perf_counter()
+    search.fit(X, y)
+    wall_seconds = time.perf_counter() - start
+
+    res = search.cv_results_
+    table = pd.DataFrame({
+        "round": res["iter"],
+        "n_estimators": res["n_resources"],
+        "params": [str(p) for p in res["params"]],
+        "r2": np.round(res["mean_test_score"], 4),
+        "fit_ms": np.round(res["mean_fit_time"] * 1000, 1),
+        "predict_ms": np.round(res["mean_score_time"] * 1000, 2),
+        "wall_ms": np.round((res["mean_fit_time"] + res["mean_score_time"]) * n_splits * 1000, 1),
+    })
+
+    final = np.flatnonzero(res["iter"] == res["iter"].max())
+    best_r2 = res["mean_test_score"][final].max()
+    good = final[res["mean_test_score"][final] >= best_r2 - tolerance]
+    winner = good[np.argmin(res["mean_score_time"][good])]
+    params = {**res["params"][winner], "n_estimators": int(res["n_resources"][winner])}
+
+    table.attrs["wall_seconds"] = round(wall_seconds, 2)
+    return params, table.sort_values(["round", "r2"], ascending=[True, False], ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune the wellness forest and publish the winner to the model store.")
+    parser.add_argument("--data", default="data/kaggle.csv", help="training CSV")
+    parser.add_argument("--jobs", type=int, default=-1, help="worker processes (-1: every core)")
+    parser.add_argument("--dry-run", action="store_true", help="print the table without publishing the winner")
+    args = parser.parse_args(argv)
+
+    params, table = tune(args.data, n_jobs=args.jobs)
+    with pd.option_context("display.max_rows", None, "display.width", 200, "display.max_colwidth", 80):
+        print(table.to_string(index=False))
+    print(f"\nsearch wall time: {table.attrs['wall_seconds']}s")
+    print(f"winner: {params}")
+    if not args.dry_run:
+        save_tuned_params(params, data=file_digest(args.data), created_at=time.strftime("%Y-%m-%d %H:%M:%S"))
+        print("published to the model store; the next load_or_train fits with it")
+
+
+if __name__ == "__main__":
+    main()
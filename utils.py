@@ -38,16 +38,20 @@ def prepare_data(df, features=None, target="mental_wellness_index_0_100"):
 # -------------------------
 # Train Random Forest Model
 # -------------------------
-def train_model(X, y, test_size=0.2, random_state=42, n_estimators=300):
+def train_model(X, y, test_size=0.2, random_state=42, n_estimators=300, n_jobs=None, **forest_params):
     """
     Train Random Forest Regressor with provided features and target.
+    Extra keyword arguments (max_depth, min_samples_leaf, ...) go to the forest;
+    n_jobs=-1 fits the trees on every core.
     Returns model + train/test splits + predictions.
     """
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=test_size, random_state=random_state
     )
     
-    model = RandomForestRegressor(n_estimators=n_estimators, random_state=random_state)
+    model = RandomForestRegressor(
+        n_estimators=n_estimators, random_state=random_state, n_jobs=n_jobs, **forest_params
+    )
     model.fit(X_train, y_train)
     y_pred = model.predict(X_test)
     